@@ -5,8 +5,12 @@ import json
 import math
 import os
 import re
+import sqlite3
 import time
-from collections import defaultdict
+from collections import Counter
+
+import numpy as np
+import orjson
 
 # ---------- PATHS ----------
 
@@ -15,14 +19,49 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 INDEX_DIR = os.path.join(PROJECT_ROOT, 'data', 'index')
 BARREL_DIR = os.path.join(INDEX_DIR, 'barrels')
 
-LEXICON_PATH = os.path.join(INDEX_DIR, 'lexicon_complete.json')
-FORWARD_INDEX_PATH = os.path.join(INDEX_DIR, 'forward_index_termid.json')
-INVERTED_INDEX_PATH = os.path.join(INDEX_DIR, 'inverted_index_termid.json')
+LEXICON_TOKENS_PATH = os.path.join(INDEX_DIR, 'lexicon.tokens')
+LEXICON_DFS_PATH = os.path.join(INDEX_DIR, 'lexicon.dfs')
+FORWARD_INDEX_PATH = os.path.join(INDEX_DIR, 'forward_index.npz')
 TERM_TO_BARREL_MAP_PATH = os.path.join(BARREL_DIR, 'term_to_barrel_map.json')
+BARREL_DB_PATH = os.path.join(BARREL_DIR, 'barrels.db')
+
+# ---------- BATCHED SAVES ----------
+
+# The lexicon, forward index and term-to-barrel map are rewritten (and the barrel
+# store committed) every INDEX_FLUSH_INTERVAL adds and on exit, not per document.
+# New documents only become searchable after a flush, and until then the open
+# barrel store transaction blocks other writers of barrels.db
+INDEX_FLUSH_INTERVAL = 100
+
+# ---------- FORWARD INDEX ----------
+
+# CSR arrays in one uncompressed .npz (MUST MATCH build_forward_index.py):
+# per-document player_ids / player_names / total_terms, term_offsets into
+# term_ids / tfs, and position_offsets into positions. Added documents store
+# no positions (their position slices are empty).
+FORWARD_INDEX_ARRAYS = ('player_ids', 'player_names', 'total_terms', 'term_offsets',
+                        'term_ids', 'tfs', 'position_offsets', 'positions')
+
+# ---------- BARREL STORE ----------
+
+# All barrels live in one SQLite file with one row per term:
+# (barrel_id, term_id) -> little-endian blob [int32 df, int32 doc_ids..., uint16 tfs...],
+# where doc_ids is sorted and tfs[i] is the term frequency in doc_ids[i].
+# JSON barrels convert with convert_barrels.py (MUST MATCH search_engine.py).
+BARREL_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    barrel_id INTEGER NOT NULL,
+    term_id INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (barrel_id, term_id)
+) WITHOUT ROWID
+"""
+DOC_ID_DTYPE = np.dtype('<i4')
+TF_DTYPE = np.dtype('<u2')
 
 # ---------- TEXT NORMALIZATION (MUST MATCH BUILD PIPELINE) ----------
 
-COMPREHENSIVE_STOP_WORDS = {
+COMPREHENSIVE_STOP_WORDS = frozenset({
     "the", "and", "in", "for", "with", "on", "at", "from", "by", "as", "is", "was",
     "are", "were", "be", "been", "have", "has", "had", "to", "of", "a", "an", "that",
     "this", "these", "those", "it", "its", "or", "but", "not", "what", "which", "who",
@@ -37,60 +76,241 @@ COMPREHENSIVE_STOP_WORDS = {
     # Stemmed versions and other universal terms
     "data", "teammat", "sourc", "career", "assist", "app", "minut",
     "available", "national", "significant", "teammate", "transfer", "goal"
-}
+})
+
+_TOKEN_RE = re.compile(r"\b[a-z]+\b")
+
+# UTF-8 byte table: ASCII punctuation/whitespace -> space; letters, digits, '_' and
+# non-ASCII bytes are kept, so split() yields the same \w runs the regex sees
+_WORD_BYTES = bytes(
+    b if b >= 128 or chr(b).isalnum() or b == ord("_") else ord(" ")
+    for b in range(256)
+)
+
+def tokenize(text: str):
+    """Same words as _TOKEN_RE.findall(text.lower()), via one bytes.translate pass."""
+    words = []
+    for piece in text.lower().encode("utf-8").translate(_WORD_BYTES).split():
+        if piece.isalpha():
+            # All-ASCII letters
+            words.append(piece.decode("ascii"))
+        elif not piece.isascii():
+            # Non-ASCII runs keep the regex's Unicode word-boundary rules
+            words.extend(_TOKEN_RE.findall(piece.decode("utf-8")))
+    return words
+
+_TWO_CHAR_SUFFIXES = frozenset(("ed", "es"))
 
 def simple_stemmer(word: str) -> str:
-    if word.endswith("ing") and len(word) > 5:
+    # Strips -ing (len > 5), -ed/-es (len > 4) or -s (len > 3), checked in that order
+    n = len(word)
+    if n <= 3:
+        return word
+    if n > 5 and word[-3:] == "ing":
         return word[:-3]
-    elif word.endswith("ed") and len(word) > 4:
-        return word[:-2]
-    elif word.endswith("es") and len(word) > 4:
+    if n > 4 and word[-2:] in _TWO_CHAR_SUFFIXES:
         return word[:-2]
-    elif word.endswith("s") and len(word) > 3:
+    if word[-1] == "s":
         return word[:-1]
     return word
 
 def normalize_and_tokenize(text: str):
-    text = text.lower()
-    tokens = re.findall(r"\b[a-z]+\b", text)
-    result = []
-    for w in tokens:
-        if w in COMPREHENSIVE_STOP_WORDS or len(w) <= 2:
-            continue
-        result.append(simple_stemmer(w))
-    return result
+    stops = COMPREHENSIVE_STOP_WORDS
+    kept = [w for w in tokenize(text) if len(w) > 2 and w not in stops]
+    # Stem each distinct word once; bios repeat names, clubs and positions
+    stems = {w: simple_stemmer(w) for w in set(kept)}
+    return [stems[w] for w in kept]
 
 # ---------- LOAD EXISTING INDEXES ----------
 
+def read_json(path: str):
+    """Parse a JSON file with orjson, falling back to json for bare NaN values."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Pandas-built artifacts can contain NaN literals (e.g. missing player names)
+        return json.loads(raw)
+
 def load_indexes():
     """Load all existing indexes into memory."""
     print("[load] Loading lexicon...")
-    with open(LEXICON_PATH, 'r', encoding='utf-8') as f:
-        lexicon = json.load(f)
-    token_to_entry = {entry["token"]: entry for entry in lexicon}
-    max_term_id = max(entry["term_id"] for entry in lexicon)
-    print(f"[done] Loaded {len(lexicon):,} tokens (max_term_id={max_term_id})")
+    # Parallel arrays indexed by term_id (MUST MATCH build_complete_lexicons.py)
+    with open(LEXICON_TOKENS_PATH, 'rb') as f:
+        term_tokens = f.read().decode('utf-8').splitlines()
+    dfs = np.fromfile(LEXICON_DFS_PATH, dtype=np.int32).tolist()
+    token_to_entry = {
+        token: {"df": df, "term_id": term_id}
+        for term_id, (token, df) in enumerate(zip(term_tokens, dfs))
+    }
+    print(f"[done] Loaded {len(token_to_entry):,} tokens (max_term_id={len(term_tokens) - 1})")
     
     print("[load] Loading forward index...")
-    with open(FORWARD_INDEX_PATH, 'r', encoding='utf-8') as f:
-        forward_index = json.load(f)
-    doc_by_id = {doc["player_id"]: doc for doc in forward_index}
-    print(f"[done] Loaded {len(forward_index):,} documents")
+    with np.load(FORWARD_INDEX_PATH) as data:
+        forward_index = {name: data[name] for name in FORWARD_INDEX_ARRAYS}
+    doc_ids = set(forward_index['player_ids'].tolist())
+    print(f"[done] Loaded {len(doc_ids):,} documents")
     
     print("[load] Loading term-to-barrel mapping...")
-    with open(TERM_TO_BARREL_MAP_PATH, 'r', encoding='utf-8') as f:
-        term_to_barrel = json.load(f)
-    print(f"[done] Loaded {len(term_to_barrel):,} mappings")
+    # Keyed by int term_id in memory; JSON keeps them as strings on disk
+    term_to_barrel = {int(term_id): barrel_name
+                      for term_id, barrel_name in read_json(TERM_TO_BARREL_MAP_PATH).items()}
+    # New terms are spread over the existing barrels (simple mod distribution)
+    num_barrels = max(
+        (barrel_id(bn) for bn in set(term_to_barrel.values())),
+        default=0
+    ) + 1
+    print(f"[done] Loaded {len(term_to_barrel):,} mappings ({num_barrels} barrels)")
+    
+    print("[load] Opening barrel store...")
+    barrel_store = open_barrel_store()
+    print(f"[done] Barrel store: {BARREL_DB_PATH}")
     
     return {
-        'lexicon': lexicon,
         'token_to_entry': token_to_entry,
-        'max_term_id': max_term_id,
+        'term_tokens': term_tokens,
         'forward_index': forward_index,
-        'doc_by_id': doc_by_id,
-        'term_to_barrel': term_to_barrel
+        'new_docs': [],
+        'doc_ids': doc_ids,
+        'term_to_barrel': term_to_barrel,
+        'num_barrels': num_barrels,
+        'barrel_store': barrel_store,
+        'adds_since_flush': 0
     }
 
+# ---------- SAVE INDEXES ----------
+
+def atomic_write(path: str, data: bytes):
+    """Write to path.tmp and rename over path, so readers never see a partial file."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def save_lexicon(indexes: dict):
+    """Write the lexicon back as lexicon.tokens (line N = term_id N) and lexicon.dfs (int32)."""
+    term_tokens = indexes['term_tokens']
+    token_to_entry = indexes['token_to_entry']
+    dfs = np.fromiter(
+        (token_to_entry[token]["df"] for token in term_tokens),
+        dtype=np.int32,
+        count=len(term_tokens)
+    )
+    atomic_write(LEXICON_DFS_PATH, dfs.tobytes())
+    atomic_write(LEXICON_TOKENS_PATH, '\n'.join(term_tokens).encode('utf-8'))
+
+def append_forward_entries(forward_index: dict, new_docs: list) -> dict:
+    """Return the forward-index arrays with (player_id, player_name, total_terms, term_ids, tfs) docs appended."""
+    def extend(name, values):
+        array = forward_index[name]
+        return np.concatenate([array, np.asarray(values, dtype=array.dtype)])
+    
+    term_counts = [len(term_ids) for _, _, _, term_ids, _ in new_docs]
+    return {
+        'player_ids': extend('player_ids', [doc[0] for doc in new_docs]),
+        # np.append widens the fixed-width string dtype for longer names
+        'player_names': np.append(forward_index['player_names'], [doc[1] for doc in new_docs]),
+        'total_terms': extend('total_terms', [doc[2] for doc in new_docs]),
+        'term_offsets': extend('term_offsets', forward_index['term_offsets'][-1] + np.cumsum(term_counts)),
+        'term_ids': extend('term_ids', [term_id for doc in new_docs for term_id in doc[3]]),
+        'tfs': extend('tfs', [tf for doc in new_docs for tf in doc[4]]),
+        # No positions for added documents: every new term entry gets an empty slice
+        'position_offsets': extend('position_offsets', [forward_index['position_offsets'][-1]] * sum(term_counts)),
+        'positions': forward_index['positions'],
+    }
+
+def save_forward_index(forward_index: dict):
+    """Write the forward-index arrays to forward_index.npz via a temp file and rename."""
+    tmp_path = FORWARD_INDEX_PATH + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **forward_index)
+    os.replace(tmp_path, FORWARD_INDEX_PATH)
+
+def flush_indexes(indexes: dict) -> int:
+    """Save the in-memory indexes and commit pending postings; returns the number of adds saved."""
+    pending = indexes['adds_since_flush']
+    if not pending:
+        return 0
+    
+    # Save lexicon
+    save_lexicon(indexes)
+    
+    # Save forward index
+    if indexes['new_docs']:
+        indexes['forward_index'] = append_forward_entries(indexes['forward_index'], indexes['new_docs'])
+        indexes['new_docs'] = []
+    save_forward_index(indexes['forward_index'])
+    
+    # Save term-to-barrel mapping
+    atomic_write(TERM_TO_BARREL_MAP_PATH, orjson.dumps(indexes['term_to_barrel'], option=orjson.OPT_NON_STR_KEYS))
+    
+    # Postings go live last: a crash before this commit only loses their postings
+    indexes['barrel_store'].commit()
+    
+    indexes['adds_since_flush'] = 0
+    return pending
+
+def close_indexes(indexes: dict):
+    """Save any pending adds and close the barrel store connection."""
+    flush_indexes(indexes)
+    indexes['barrel_store'].close()
+
+# ---------- BARREL STORE ----------
+
+def barrel_id(barrel_name: str) -> int:
+    return int(barrel_name.rsplit('_', 1)[1])
+
+def open_barrel_store():
+    """Open (creating if needed) the SQLite barrel store."""
+    os.makedirs(BARREL_DIR, exist_ok=True)
+    conn = sqlite3.connect(BARREL_DB_PATH)
+    # WAL lets the search engine keep reading while documents are added
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(BARREL_STORE_SCHEMA)
+    return conn
+
+def encode_postings(df: int, doc_ids, tfs) -> bytes:
+    """Pack a term's df and parallel doc_ids/tfs into one postings blob."""
+    tfs = np.asarray(tfs)
+    if len(tfs) and tfs.max() > np.iinfo(TF_DTYPE).max:
+        raise ValueError(f"term frequency {tfs.max()} does not fit in a postings blob")
+    return (np.array([df], dtype=DOC_ID_DTYPE).tobytes()
+            + np.asarray(doc_ids, dtype=DOC_ID_DTYPE).tobytes()
+            + tfs.astype(TF_DTYPE).tobytes())
+
+def decode_postings(data: bytes):
+    """Unpack a postings blob into (df, doc_ids, tfs); the arrays are views over `data`."""
+    n = (len(data) - DOC_ID_DTYPE.itemsize) // (DOC_ID_DTYPE.itemsize + TF_DTYPE.itemsize)
+    df = int(np.frombuffer(data, dtype=DOC_ID_DTYPE, count=1)[0])
+    doc_ids = np.frombuffer(data, dtype=DOC_ID_DTYPE, count=n, offset=DOC_ID_DTYPE.itemsize)
+    tfs = np.frombuffer(data, dtype=TF_DTYPE, count=n, offset=DOC_ID_DTYPE.itemsize * (1 + n))
+    return df, doc_ids, tfs
+
+def update_term_postings(store, barrel_name: str, term_id: int, df: int, player_id: int, tf: int):
+    """Add one document to a term's postings row in the barrel store."""
+    key = (barrel_id(barrel_name), term_id)
+    row = store.execute(
+        "SELECT data FROM postings WHERE barrel_id = ? AND term_id = ?", key
+    ).fetchone()
+    if row is None:
+        doc_ids, tfs = np.empty(0, dtype=DOC_ID_DTYPE), np.empty(0, dtype=TF_DTYPE)
+    else:
+        _, doc_ids, tfs = decode_postings(row[0])
+    
+    # Keep doc_ids sorted; tfs moves in lockstep
+    i = int(np.searchsorted(doc_ids, player_id))
+    if i < len(doc_ids) and doc_ids[i] == player_id:
+        tfs = tfs.copy()
+        tfs[i] = tf
+    else:
+        doc_ids = np.insert(doc_ids, i, player_id)
+        tfs = np.insert(tfs, i, tf)
+    store.execute(
+        "INSERT OR REPLACE INTO postings (barrel_id, term_id, data) VALUES (?, ?, ?)",
+        (*key, encode_postings(df, doc_ids, tfs))
+    )
+
 # ---------- ADD NEW DOCUMENT ----------
 
 def add_document(player_data: dict, indexes: dict):
@@ -116,7 +336,14 @@ def add_document(player_data: dict, indexes: dict):
     if not player_id or not player_name:
         return {"error": "Missing required fields: player_id, player_name"}
     
-    if player_id in indexes['doc_by_id']:
+    if not isinstance(player_id, int):
+        return {"error": "player_id must be an integer"}
+    
+    # Postings store doc_ids as int32
+    if not 0 < player_id <= np.iinfo(DOC_ID_DTYPE).max:
+        return {"error": f"player_id must be between 1 and {np.iinfo(DOC_ID_DTYPE).max}"}
+    
+    if player_id in indexes['doc_ids']:
         return {"error": f"Player ID {player_id} already exists"}
     
     print(f"\n[add] Adding player: {player_name} (ID={player_id})")
@@ -130,122 +357,67 @@ def add_document(player_data: dict, indexes: dict):
         return {"error": "No valid tokens found in document"}
     
     # Count term frequencies
-    term_freq = defaultdict(int)
-    for token in tokens:
-        term_freq[token] += 1
+    term_freq = Counter(tokens)
     
     total_terms = len(tokens)
     unique_terms = len(term_freq)
     print(f"   Found {total_terms} tokens, {unique_terms} unique")
     
+    # Postings store tfs as uint16; check before any index state changes
+    if term_freq and max(term_freq.values()) > np.iinfo(TF_DTYPE).max:
+        return {"error": f"Term frequency exceeds {np.iinfo(TF_DTYPE).max}"}
+    
     # 2. Update lexicon (assign term_ids to new tokens)
     print("[step 2/5] Updating lexicon...")
     new_tokens = []
-    next_term_id = indexes['max_term_id'] + 1
+    next_term_id = len(indexes['term_tokens'])
     
     for token, tf in term_freq.items():
         if token not in indexes['token_to_entry']:
             # New token - add to lexicon
-            new_entry = {
-                "token": token,
+            indexes['token_to_entry'][token] = {
                 "df": 1,  # This document is the first
                 "term_id": next_term_id
             }
-            indexes['lexicon'].append(new_entry)
-            indexes['token_to_entry'][token] = new_entry
+            indexes['term_tokens'].append(token)
             new_tokens.append(token)
             next_term_id += 1
         else:
             # Existing token - increment document frequency
             indexes['token_to_entry'][token]["df"] += 1
     
-    indexes['max_term_id'] = next_term_id - 1
     print(f"   Added {len(new_tokens)} new tokens to lexicon")
     
     # 3. Update forward index
     print("[step 3/5] Updating forward index...")
-    term_ids_in_doc = {}
-    for token, tf in term_freq.items():
-        entry = indexes['token_to_entry'][token]
-        term_id = entry["term_id"]
-        term_ids_in_doc[term_id] = {
-            "token": token,
-            "tf": tf
-        }
+    term_ids_in_doc = [indexes['token_to_entry'][token]["term_id"] for token in term_freq]
     
-    forward_entry = {
-        "player_id": player_id,
-        "player_name": player_name,
-        "total_terms": total_terms,
-        "unique_terms": unique_terms,
-        "terms": term_ids_in_doc
-    }
-    indexes['forward_index'].append(forward_entry)
-    indexes['doc_by_id'][player_id] = forward_entry
+    # Appended to the forward-index arrays on the next flush
+    indexes['new_docs'].append(
+        (player_id, player_name, total_terms, term_ids_in_doc, list(term_freq.values()))
+    )
+    indexes['doc_ids'].add(player_id)
     print(f"   Added document to forward index")
     
     # 4. Update barrels (inverted index distributed)
     print("[step 4/5] Updating barrels...")
+    
     barrels_updated = set()
     
+    # Postings stay in the open transaction until the next flush_indexes()
+    store = indexes['barrel_store']
     for token, tf in term_freq.items():
         entry = indexes['token_to_entry'][token]
         term_id = entry["term_id"]
-        term_id_str = str(term_id)
         
         # Determine which barrel this term belongs to
-        barrel_name = indexes['term_to_barrel'].get(term_id_str)
+        barrel_name = indexes['term_to_barrel'].get(term_id)
         
         if not barrel_name:
-            # New term - assign to a barrel (use simple mod distribution)
-            num_barrels = max(int(bn.split('_')[1]) for bn in set(indexes['term_to_barrel'].values())) + 1
-            barrel_idx = term_id % num_barrels
-            barrel_name = f"barrel_{barrel_idx:03d}"
-            indexes['term_to_barrel'][term_id_str] = barrel_name
-        
-        # Load barrel, update, save back
-        barrel_path = os.path.join(BARREL_DIR, f"{barrel_name}.json")
-        
-        if os.path.exists(barrel_path):
-            with open(barrel_path, 'r', encoding='utf-8') as f:
-                barrel_data = json.load(f)
-        else:
-            barrel_data = {
-                'metadata': {
-                    'term_count': 0,
-                    'posting_count': 0,
-                    'barrel_name': barrel_name
-                },
-                'inverted_index': {}
-            }
-        
-        # Update postings for this term
-        if term_id_str not in barrel_data['inverted_index']:
-            barrel_data['inverted_index'][term_id_str] = {
-                'token': token,
-                'df': entry['df'],
-                'postings': {}
-            }
-        
-        # Add this document to postings
-        barrel_data['inverted_index'][term_id_str]['postings'][str(player_id)] = {
-            "tf": tf
-        }
-        
-        # Update df in barrel
-        barrel_data['inverted_index'][term_id_str]['df'] = entry['df']
-        
-        # Update metadata
-        barrel_data['metadata']['term_count'] = len(barrel_data['inverted_index'])
-        barrel_data['metadata']['posting_count'] = sum(
-            len(term_data['postings']) 
-            for term_data in barrel_data['inverted_index'].values()
-        )
-        
-        # Save barrel
-        with open(barrel_path, 'w', encoding='utf-8') as f:
-            json.dump(barrel_data, f, ensure_ascii=False)
+            barrel_name = f"barrel_{term_id % indexes['num_barrels']:03d}"
+            indexes['term_to_barrel'][term_id] = barrel_name
         
+        update_term_postings(store, barrel_name, term_id, entry['df'], player_id, tf)
         barrels_updated.add(barrel_name)
     
     print(f"   Updated {len(barrels_updated)} barrels: {sorted(barrels_updated)}")
@@ -253,19 +425,11 @@ def add_document(player_data: dict, indexes: dict):
     # 5. Save updated indexes
     print("[step 5/5] Saving updated indexes...")
     
-    # Save lexicon
-    with open(LEXICON_PATH, 'w', encoding='utf-8') as f:
-        json.dump(indexes['lexicon'], f, ensure_ascii=False)
-    
-    # Save forward index
-    with open(FORWARD_INDEX_PATH, 'w', encoding='utf-8') as f:
-        json.dump(indexes['forward_index'], f, ensure_ascii=False)
-    
-    # Save term-to-barrel mapping
-    with open(TERM_TO_BARREL_MAP_PATH, 'w', encoding='utf-8') as f:
-        json.dump(indexes['term_to_barrel'], f, ensure_ascii=False)
-    
-    print(f"   Saved all indexes")
+    indexes['adds_since_flush'] += 1
+    if indexes['adds_since_flush'] >= INDEX_FLUSH_INTERVAL:
+        print(f"   Saved all indexes ({flush_indexes(indexes)} document(s))")
+    else:
+        print(f"   Deferred ({indexes['adds_since_flush']}/{INDEX_FLUSH_INTERVAL} adds pending)")
     
     elapsed = time.perf_counter() - start_time
     
@@ -312,23 +476,31 @@ if __name__ == "__main__":
     print(json.dumps(example, indent=2))
     print("\n" + "-" * 60 + "\n")
     
-    while True:
-        print("Enter player data (JSON) or 'exit':")
-        user_input = input("> ").strip()
-        
-        if user_input.lower() == 'exit':
-            break
-        
-        try:
-            player_data = json.loads(user_input)
-            result = add_document(player_data, indexes)
-            print("\n[result]")
-            print(json.dumps(result, indent=2))
-        except json.JSONDecodeError as e:
-            print(f"[error] Invalid JSON: {e}")
-        except Exception as e:
-            print(f"[error] {e}")
-        
-        print("\n" + "-" * 60 + "\n")
-    
+    # Pending adds are saved however the loop ends (exit, EOF, Ctrl-C or an error)
+    try:
+        while True:
+            print("Enter player data (JSON) or 'exit':")
+            try:
+                user_input = input("> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+            
+            if user_input.lower() == 'exit':
+                break
+            
+            try:
+                player_data = json.loads(user_input)
+                result = add_document(player_data, indexes)
+                print("\n[result]")
+                print(json.dumps(result, indent=2))
+            except json.JSONDecodeError as e:
+                print(f"[error] Invalid JSON: {e}")
+            except Exception as e:
+                print(f"[error] {e}")
+            
+            print("\n" + "-" * 60 + "\n")
+    finally:
+        print(f"[flush] Saving {indexes['adds_since_flush']} pending document(s)...")
+        close_indexes(indexes)
     print("\n[exit] Exiting document addition system.")
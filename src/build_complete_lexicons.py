@@ -1,18 +1,17 @@
 import json
+import os
 import re
-from collections import defaultdict
+from collections import Counter
+from itertools import islice
+from multiprocessing import Pool
 
-print("BUILDING COMPLETE LEXICON (ONE FILE WITH DF + TERM ID)...")
-print("=" * 50)
+import numpy as np
 
-# Load search documents (array JSON)
-print("Loading search documents...")
-with open("data/processed/complete_player_profiles.json", "r", encoding="utf-8") as f:
-    search_documents = json.load(f)
-print(f"Loaded {len(search_documents)} documents")
+# Documents handed to each worker at a time
+CHUNK_SIZE = 1000
 
 # Comprehensive stop words list
-COMPREHENSIVE_STOP_WORDS = {
+COMPREHENSIVE_STOP_WORDS = frozenset({
     "the", "and", "in", "for", "with", "on", "at", "from", "by", "as", "is", "was",
     "are", "were", "be", "been", "have", "has", "had", "to", "of", "a", "an", "that",
     "this", "these", "those", "it", "its", "or", "but", "not", "what", "which", "who",
@@ -27,84 +26,121 @@ COMPREHENSIVE_STOP_WORDS = {
     # Stemmed versions and other universal terms
     "data", "teammat", "sourc", "career", "assist", "app", "minut",
     "available", "national", "significant", "teammate", "transfer", "goal"
-}
+})
+
+# Word tokenizer shared by content and club names
+_TOKEN_RE = re.compile(r"\b[a-z]+\b")
+
+# UTF-8 byte table: ASCII punctuation/whitespace -> space; letters, digits, '_' and
+# non-ASCII bytes are kept, so split() yields the same \w runs the regex sees
+_WORD_BYTES = bytes(
+    b if b >= 128 or chr(b).isalnum() or b == ord("_") else ord(" ")
+    for b in range(256)
+)
+
+def tokenize(text: str):
+    """Same words as _TOKEN_RE.findall(text.lower()), via one bytes.translate pass."""
+    words = []
+    for piece in text.lower().encode("utf-8").translate(_WORD_BYTES).split():
+        if piece.isalpha():
+            # All-ASCII letters
+            words.append(piece.decode("ascii"))
+        elif not piece.isascii():
+            # Non-ASCII runs keep the regex's Unicode word-boundary rules
+            words.extend(_TOKEN_RE.findall(piece.decode("utf-8")))
+    return words
+
+_TWO_CHAR_SUFFIXES = frozenset(("ed", "es"))
 
 def simple_stemmer(word: str) -> str:
     """Basic stemming for common suffixes"""
-    if word.endswith("ing") and len(word) > 5:
+    # Strips -ing (len > 5), -ed/-es (len > 4) or -s (len > 3), checked in that order
+    n = len(word)
+    if n <= 3:
+        return word
+    if n > 5 and word[-3:] == "ing":
         return word[:-3]
-    elif word.endswith("ed") and len(word) > 4:
+    if n > 4 and word[-2:] in _TWO_CHAR_SUFFIXES:
         return word[:-2]
-    elif word.endswith("es") and len(word) > 4:
-        return word[:-2]
-    elif word.endswith("s") and len(word) > 3:
+    if word[-1] == "s":
         return word[:-1]
     return word
 
-print("Building ONE COMPLETE lexicon with DF and term IDs...")
-
-# token -> document frequency
-lexicon_df = defaultdict(int)
-
-for doc_idx, doc in enumerate(search_documents):
-    # Use detailed_content as text
+def document_text(doc) -> str:
+    """detailed_content plus metadata.current_club, tokenized in one pass."""
     text = doc.get("detailed_content", "")
     if not isinstance(text, str):
         text = str(text)
-    text = text.lower()
-
-    # Tokens appearing in this document
-    doc_tokens = set()
-
-    # From detailed_content
-    words = re.findall(r"\b[a-z]+\b", text)
-    for word in words:
-        if len(word) <= 2:
-            continue
-        stemmed = simple_stemmer(word)
-        if stemmed in COMPREHENSIVE_STOP_WORDS:
-            continue
-        doc_tokens.add(stemmed)
-
-    # From metadata.current_club
+
     metadata = doc.get("metadata", {}) or {}
     current_club = metadata.get("current_club")
     if isinstance(current_club, str):
-        club_text = current_club.lower()
-        club_words = re.findall(r"\b[a-z]+\b", club_text)
-        for word in club_words:
-            if len(word) > 2:
-                stemmed = simple_stemmer(word)
-                if stemmed not in COMPREHENSIVE_STOP_WORDS:
-                    doc_tokens.add(stemmed)
-
-    # Update DF counts (once per doc)
-    for token in doc_tokens:
-        lexicon_df[token] += 1
-
-    if (doc_idx + 1) % 10000 == 0:
-        print(f"Processed {doc_idx + 1} documents...")
-
-print("\nLEXICON STATISTICS:")
-print("=" * 40)
-print(f"Total unique tokens: {len(lexicon_df):,}")
-print(f"Total DF sum: {sum(lexicon_df.values()):,}")
-
-# Build list of entries and sort by DF desc
-entries = [
-    {"token": token, "df": df}
-    for token, df in lexicon_df.items()
-]
-entries.sort(key=lambda x: x["df"], reverse=True)
-
-# Assign term_id to each token (0-based; use +1 for 1-based if you prefer)
-for idx, entry in enumerate(entries):
-    entry["term_id"] = idx
-
-# Save ONLY the entries list; perfect for forward + inverted index building
-with open("data/index/lexicon_complete.json", "w", encoding="utf-8") as f:
-    json.dump(entries, f, ensure_ascii=False, indent=2)
-
-print("\nONE COMPLETE LEXICON WITH DF + TERM IDs BUILT!")
-print("Saved: data/index/lexicon_complete.json")
-print(f"{len(entries):,} tokens with term IDs ready for indexing!")
+        text = f"{text} {current_club}"
+    return text
+
+def count_document_frequencies(lines):
+    """Worker: parse a chunk of JSON Lines profiles and count their DFs."""
+    chunk_df = Counter()
+    for line in lines:
+        text = document_text(json.loads(line))
+        # Dedupe before stemming, then drop stop words from the stems
+        words = {word for word in tokenize(text) if len(word) > 2}
+        doc_tokens = {simple_stemmer(word) for word in words}
+        doc_tokens -= COMPREHENSIVE_STOP_WORDS
+
+        # Update DF counts (once per doc)
+        chunk_df.update(doc_tokens)
+    return len(lines), chunk_df
+
+def read_chunks(f, size):
+    """Yield lists of up to `size` lines from an open file."""
+    while True:
+        lines = list(islice(f, size))
+        if not lines:
+            return
+        yield lines
+
+if __name__ == "__main__":
+    print("BUILDING COMPLETE LEXICON (ONE FILE WITH DF + TERM ID)...")
+    print("=" * 50)
+
+    print("Building ONE COMPLETE lexicon with DF and term IDs...")
+
+    # token -> document frequency
+    # Search documents (JSON Lines) are streamed to the workers in chunks and
+    # merged in document order, so tokens keep their first-seen order
+    lexicon_df = Counter()
+    processed = 0
+    with open("data/processed/complete_player_profiles.jsonl", "r", encoding="utf-8") as f, Pool(os.cpu_count()) as pool:
+        for chunk_len, chunk_df in pool.imap(count_document_frequencies, read_chunks(f, CHUNK_SIZE)):
+            lexicon_df.update(chunk_df)
+            processed += chunk_len
+            if processed % 10000 == 0:
+                print(f"Processed {processed} documents...")
+    print(f"Loaded {processed} documents")
+
+    print("\nLEXICON STATISTICS:")
+    print("=" * 40)
+    print(f"Total unique tokens: {len(lexicon_df):,}")
+    print(f"Total DF sum: {sum(lexicon_df.values()):,}")
+
+    # Build list of entries and sort by DF desc
+    entries = [
+        {"token": token, "df": df}
+        for token, df in lexicon_df.items()
+    ]
+    entries.sort(key=lambda x: x["df"], reverse=True)
+
+    # Assign term_id to each token (0-based; use +1 for 1-based if you prefer)
+    for idx, entry in enumerate(entries):
+        entry["term_id"] = idx
+
+    # Save as parallel arrays indexed by term_id:
+    # lexicon.tokens holds one token per line, lexicon.dfs the DFs as raw int32
+    with open("data/index/lexicon.tokens", "wb") as f:
+        f.write("\n".join(entry["token"] for entry in entries).encode("utf-8"))
+    np.array([entry["df"] for entry in entries], dtype=np.int32).tofile("data/index/lexicon.dfs")
+
+    print("\nONE COMPLETE LEXICON WITH DF + TERM IDs BUILT!")
+    print("Saved: data/index/lexicon.tokens, data/index/lexicon.dfs")
+    print(f"{len(entries):,} tokens with term IDs ready for indexing!")
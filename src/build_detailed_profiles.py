@@ -1,66 +1,111 @@
 import pandas as pd
-import json
+import orjson
 import os
 from datetime import datetime
-
-print("BUILDING COMPLETE PLAYER PROFILES WITH ALL DATA...")
-print("=" * 50)
+from multiprocessing import Pool
 
 base_path = "data/raw"
 
-def load_data_safely(file_path):
+# Players handed to each worker at a time
+POOL_CHUNK_SIZE = 500
+
+# Only the columns the profile builders read, per dataset
+PROFILE_COLUMNS = ['player_id', 'player_name', 'position', 'citizenship',
+                   'current_club_name', 'date_of_birth', 'height', 'foot']
+PERFORMANCE_COLUMNS = ['player_id', 'season_name', 'team_name', 'goals', 'assists',
+                       'nb_on_pitch', 'minutes_played', 'yellow_cards', 'direct_red_cards']
+TRANSFER_COLUMNS = ['player_id', 'season_name', 'transfer_date', 'from_team_name',
+                    'to_team_name', 'transfer_fee']
+MARKET_VALUE_COLUMNS = ['player_id', 'date_unix', 'value']
+INJURY_COLUMNS = ['player_id', 'season_name', 'injury_reason', 'days_missed', 'games_missed']
+NATIONAL_COLUMNS = ['player_id', 'matches', 'goals', 'career_state', 'debut']
+TEAMMATE_COLUMNS = ['player_id', 'teammate_player_name', 'minutes_played_with']
+
+# Narrow integer types for columns that are never missing.
+# Columns with gaps (goals, minutes_played, value, ...) stay float64 so output formatting is unchanged.
+PROFILE_DTYPES = {'player_id': 'int32'}
+PERFORMANCE_DTYPES = {'player_id': 'int32', 'assists': 'int32', 'nb_on_pitch': 'int32',
+                      'yellow_cards': 'int32', 'direct_red_cards': 'int32'}
+TRANSFER_DTYPES = {'player_id': 'int32', 'transfer_fee': 'int32'}
+MARKET_VALUE_DTYPES = {'player_id': 'int32'}
+INJURY_DTYPES = {'player_id': 'int32', 'games_missed': 'int32'}
+NATIONAL_DTYPES = {'player_id': 'int32', 'matches': 'int32', 'goals': 'int32'}
+TEAMMATE_DTYPES = {'player_id': 'int32'}
+
+# Repeated strings used as groupby keys, stored as categoricals (sorted categories, so
+# groups come out in the same order as with plain strings)
+PERFORMANCE_CATEGORIES = ['season_name', 'team_name']
+
+def load_data_safely(file_path, usecols=None, dtypes=None, categories=None):
+    # Prefer the Parquet copy written by convert_raw_to_parquet.py: columnar, already typed
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
     try:
-        return pd.read_csv(file_path, low_memory=False)
+        if os.path.exists(parquet_path):
+            df = pd.read_parquet(parquet_path, columns=usecols)
+            if dtypes:
+                df = df.astype(dtypes)
+        else:
+            df = pd.read_csv(file_path, usecols=usecols, dtype=dtypes, low_memory=False)
+        # astype (not read_csv's dtype='category') so the categories are sorted
+        return df.astype(dict.fromkeys(categories, 'category')) if categories else df
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
         return pd.DataFrame()
 
-print("Loading ALL datasets...")
-profiles_df = load_data_safely(f"{base_path}/player_profiles/player_profiles.csv")
-performances_df = load_data_safely(f"{base_path}/player_performances/player_performances.csv")
-transfer_df = load_data_safely(f"{base_path}/transfer_history/transfer_history.csv")
-market_value_df = load_data_safely(f"{base_path}/player_market_value/player_market_value.csv")
-injuries_df = load_data_safely(f"{base_path}/player_injuries/player_injuries.csv")
-national_df = load_data_safely(f"{base_path}/player_national_performances/player_national_performances.csv")
-teammates_df = load_data_safely(f"{base_path}/player_teammates_played_with/player_teammates_played_with.csv")
-
-print(f"Datasets loaded:")
-print(f"   - Profiles: {len(profiles_df)} players")
-print(f"   - Performances: {len(performances_df):,} season records")
-print(f"   - Transfers: {len(transfer_df):,} transfer records")
-print(f"   - Market Values: {len(market_value_df):,} value records")
-
-def get_transfer_history(player_id, transfer_df):
-    """Get complete transfer history"""
-    player_transfers = transfer_df[transfer_df['player_id'] == player_id]
-    if player_transfers.empty:
-        return "No transfer history available."
+def keep_profile_players(df, player_ids):
+    """Drop rows for players outside the profile set (semi-join on player_id)"""
+    if df.empty:
+        return df
+    return df[df['player_id'].isin(player_ids)]
+
+# Section text for players without any records in a dataset
+NO_CAREER_TOTALS = (0, 0, 0)
+NO_TRANSFER_HISTORY = "No transfer history available."
+NO_SEASON_PERFORMANCES = "No performance data available."
+NO_MARKET_VALUE_HISTORY = "No market value data available."
+NO_INJURY_HISTORY = "##Injury History\nNo significant injury history recorded."
+NO_NATIONAL_CAREER = "##International Career\nNo national team data available."
+NO_TEAMMATES = "##Notable Teammates\nNo teammate data available."
+
+def sections_by_player(player_ids, lines, header, players=()):
+    """Join per-row lines into one header + lines section per player_id.
+
+    Rows keep their order within each player; `players` get a header-only
+    section even when none of their rows produced a line.
+    """
+    sections = {player_id: header for player_id in players}
+    joined = pd.Series(lines, index=player_ids, dtype=object).groupby(level=0, sort=False).agg(''.join)
+    for player_id, text in joined.items():
+        sections[player_id] = header + text
+    return sections
+
+def get_transfer_histories(transfer_df):
+    """Get complete transfer history for every player"""
+    if transfer_df.empty:
+        return {}
     
     # Sort by transfer date
-    player_transfers = player_transfers.sort_values('transfer_date')
-    
-    transfer_text = "##Career Transfers\n"
-    for _, transfer in player_transfers.iterrows():
-        from_team = transfer.get('from_team_name', 'Unknown')
-        to_team = transfer.get('to_team_name', 'Unknown')
-        season = transfer.get('season_name', '')
-        fee = transfer.get('transfer_fee', 0)
-        
-        transfer_text += f"- **{season}**: {from_team} → {to_team}"
-        if fee > 0:
-            transfer_text += f" (€{fee:,})"
-        transfer_text += f" - {transfer.get('transfer_date', '')}\n"
-    
-    return transfer_text
-
-def get_season_performances(player_id, performances_df):
-    """Get season-by-season performance stats"""
-    player_performances = performances_df[performances_df['player_id'] == player_id]
-    if player_performances.empty:
-        return "No performance data available."
-    
-    # Group by season and team
-    season_stats = player_performances.groupby(['season_name', 'team_name']).agg({
+    transfers = transfer_df.sort_values('transfer_date', kind='stable')
+    
+    lines = [
+        f"- **{season}**: {from_team} → {to_team}{f' (€{fee:,})' if fee > 0 else ''} - {transfer_date}\n"
+        for season, from_team, to_team, fee, transfer_date in zip(
+            transfers['season_name'].tolist(),
+            transfers['from_team_name'].tolist(),
+            transfers['to_team_name'].tolist(),
+            transfers['transfer_fee'].tolist(),
+            transfers['transfer_date'].tolist()
+        )
+    ]
+    return sections_by_player(transfers['player_id'].tolist(), lines, "##Career Transfers\n")
+
+def get_season_performances(performances_df):
+    """Get season-by-season performance stats for every player"""
+    if performances_df.empty:
+        return {}
+    
+    # Group by player, season and team
+    season_stats = performances_df.groupby(['player_id', 'season_name', 'team_name']).agg({
         'goals': 'sum',
         'assists': 'sum', 
         'nb_on_pitch': 'sum',
@@ -69,175 +114,277 @@ def get_season_performances(player_id, performances_df):
         'direct_red_cards': 'sum'
     }).reset_index()
     
-    performance_text = "##Season Performance\n"
-    for _, season in season_stats.iterrows():
-        apps = season.get('nb_on_pitch', 0)
-        goals = season.get('goals', 0)
-        assists = season.get('assists', 0)
-        team = season.get('team_name', 'Unknown')
-        
-        if apps > 0:
-            performance_text += f"- **{season['season_name']}** ({team}): {apps} apps, {goals} goals, {assists} assists"
-            if season.get('minutes_played', 0) > 0:
-                performance_text += f", {season['minutes_played']:,} minutes"
-            performance_text += "\n"
-    
-    return performance_text
-
-def get_market_value_history(player_id, market_value_df):
-    """Get market value progression"""
-    player_values = market_value_df[market_value_df['player_id'] == player_id]
-    if player_values.empty:
-        return "No market value data available."
+    lines = [
+        f"- **{season}** ({team}): {apps} apps, {goals} goals, {assists} assists"
+        f"{f', {minutes:,} minutes' if minutes > 0 else ''}\n"
+        if apps > 0 else ""
+        for season, team, apps, goals, assists, minutes in zip(
+            season_stats['season_name'].tolist(),
+            season_stats['team_name'].tolist(),
+            season_stats['nb_on_pitch'].tolist(),
+            season_stats['goals'].tolist(),
+            season_stats['assists'].tolist(),
+            season_stats['minutes_played'].tolist()
+        )
+    ]
+    return sections_by_player(
+        season_stats['player_id'].tolist(), lines, "##Season Performance\n",
+        players=performances_df['player_id'].unique().tolist()
+    )
+
+def get_market_value_histories(market_value_df):
+    """Get market value progression for every player"""
+    if market_value_df.empty:
+        return {}
     
     # Get latest values (most recent first)
-    latest_values = player_values.sort_values('date_unix', ascending=False).head(8)
-    
-    value_text = "##Market Value History\n"
-    for _, value in latest_values.iterrows():
-        date = value.get('date_unix', '')
-        market_value = value.get('value', 0)
-        if market_value > 0:
-            value_text += f"- **{date}**: €{market_value:,.0f}\n"
-    
-    return value_text
-
-def get_injury_history(player_id, injuries_df):
-    player_injuries = injuries_df[injuries_df['player_id'] == player_id]
-    if player_injuries.empty:
-        return "##Injury History\nNo significant injury history recorded."
-    
-    injury_text = "##Injury History\n"
-    for _, injury in player_injuries.head(8).iterrows():
-        reason = injury.get('injury_reason', 'Unknown')
-        season = injury.get('season_name', '')
-        days = injury.get('days_missed', 0)
-        games = injury.get('games_missed', 0)
-        
-        injury_text += f"- **{reason}** ({season}): {days} days missed"
-        if games > 0:
-            injury_text += f", {games} games missed"
-        injury_text += "\n"
-    
-    return injury_text
-
-def get_national_career(player_id, national_df):
-    player_national = national_df[national_df['player_id'] == player_id]
-    if player_national.empty:
-        return "##International Career\nNo national team data available."
-    
-    nat_career = "##International Career\n"
-    for _, nat in player_national.iterrows():
-        matches = nat.get('matches', 0)
-        goals = nat.get('goals', 0)
-        
-        if matches > 0:
-            nat_career += f"- **Caps**: {matches}, **Goals**: {goals}"
-            if pd.notna(nat.get('career_state')):
-                nat_career += f", **Status**: {nat.get('career_state')}"
-            if pd.notna(nat.get('debut')):
-                nat_career += f", **Debut**: {nat.get('debut')}"
-            nat_career += "\n"
-    
-    return nat_career
-
-def get_teammates(player_id, teammates_df):
-    player_teammates = teammates_df[teammates_df['player_id'] == player_id]
-    if player_teammates.empty:
-        return "##Notable Teammates\nNo teammate data available."
-    
-    top_teammates = player_teammates.nlargest(6, 'minutes_played_with')
-    teammates_text = "##Notable Teammates\n"
-    for _, tm in top_teammates.iterrows():
-        teammate_name = tm.get('teammate_player_name', 'N/A')
-        minutes = tm.get('minutes_played_with', 0)
-        if minutes > 0:
-            hours = minutes // 60
-            teammates_text += f"- **{teammate_name}**: {hours:,} hours played together\n"
-    
-    return teammates_text
-
-def get_player_summary(player_profile, performances_df, player_id):
-    """Generate a career summary"""
-    player_performances = performances_df[performances_df['player_id'] == player_id]
+    latest_values = (market_value_df.sort_values('date_unix', ascending=False, kind='stable')
+                     .groupby('player_id', sort=False).head(8))
     
-    total_goals = player_performances['goals'].sum()
-    total_assists = player_performances['assists'].sum()
-    total_apps = player_performances['nb_on_pitch'].sum()
+    lines = [
+        f"- **{date}**: €{market_value:,.0f}\n" if market_value > 0 else ""
+        for date, market_value in zip(
+            latest_values['date_unix'].tolist(),
+            latest_values['value'].tolist()
+        )
+    ]
+    return sections_by_player(latest_values['player_id'].tolist(), lines, "##Market Value History\n")
+
+def get_injury_histories(injuries_df):
+    if injuries_df.empty:
+        return {}
     
-    summary = f"##Career Summary\n"
-    summary += f"- **Position**: {player_profile.get('position', 'N/A')}\n"
-    summary += f"- **Nationality**: {player_profile.get('citizenship', 'N/A')}\n"
+    injuries = injuries_df.groupby('player_id', sort=False).head(8)
+    lines = [
+        f"- **{reason}** ({season}): {days} days missed{f', {games} games missed' if games > 0 else ''}\n"
+        for reason, season, days, games in zip(
+            injuries['injury_reason'].tolist(),
+            injuries['season_name'].tolist(),
+            injuries['days_missed'].tolist(),
+            injuries['games_missed'].tolist()
+        )
+    ]
+    return sections_by_player(injuries['player_id'].tolist(), lines, "##Injury History\n")
+
+def get_national_careers(national_df):
+    if national_df.empty:
+        return {}
+    
+    # Missing values come out of tolist() as None or NaN (NaN != NaN); checked inline
+    # instead of per-row pd.notna calls
+    lines = [
+        f"- **Caps**: {matches}, **Goals**: {goals}"
+        f"{f', **Status**: {career_state}' if career_state is not None and career_state == career_state else ''}"
+        f"{f', **Debut**: {debut}' if debut is not None and debut == debut else ''}\n"
+        if matches > 0 else ""
+        for matches, goals, career_state, debut in zip(
+            national_df['matches'].tolist(),
+            national_df['goals'].tolist(),
+            national_df['career_state'].tolist(),
+            national_df['debut'].tolist()
+        )
+    ]
+    return sections_by_player(national_df['player_id'].tolist(), lines, "##International Career\n")
+
+def get_teammates(teammates_df):
+    if teammates_df.empty:
+        return {}
+    
+    # Six most-played-with teammates per player (nlargest skips missing minutes)
+    top_teammates = (teammates_df.dropna(subset=['minutes_played_with'])
+                     .sort_values('minutes_played_with', ascending=False, kind='stable')
+                     .groupby('player_id', sort=False).head(6))
+    lines = [
+        f"- **{teammate_name}**: {minutes // 60:,} hours played together\n" if minutes > 0 else ""
+        for teammate_name, minutes in zip(
+            top_teammates['teammate_player_name'].tolist(),
+            top_teammates['minutes_played_with'].tolist()
+        )
+    ]
+    return sections_by_player(
+        top_teammates['player_id'].tolist(), lines, "##Notable Teammates\n",
+        players=teammates_df['player_id'].unique().tolist()
+    )
+
+def get_career_totals(performances_df):
+    """Sum goals, assists and appearances for every player in one groupby pass"""
+    if performances_df.empty:
+        return {}
+    
+    totals = performances_df.groupby('player_id', sort=False)[['goals', 'assists', 'nb_on_pitch']].sum()
+    return dict(zip(totals.index.tolist(), totals.itertuples(index=False, name=None)))
+
+def get_player_summary(position, citizenship, current_club_name, career_totals):
+    """Generate a career summary"""
+    total_goals, total_assists, total_apps = career_totals
+    
+    parts = [
+        "##Career Summary\n",
+        f"- **Position**: {position}\n",
+        f"- **Nationality**: {citizenship}\n",
+    ]
     
     if total_apps > 0:
-        summary += f"- **Career Apps**: {total_apps:,}\n"
+        parts.append(f"- **Career Apps**: {total_apps:,}\n")
     if total_goals > 0:
-        summary += f"- **Career Goals**: {total_goals:,}\n"
+        parts.append(f"- **Career Goals**: {total_goals:,}\n")
     if total_assists > 0:
-        summary += f"- **Career Assists**: {total_assists:,}\n"
+        parts.append(f"- **Career Assists**: {total_assists:,}\n")
     
-    summary += f"- **Current Club**: {player_profile.get('current_club_name', 'N/A')}\n"
+    parts.append(f"- **Current Club**: {current_club_name}\n")
     
-    return summary
+    return "".join(parts)
 
-print(f"Creating COMPLETE profiles for {len(profiles_df)} players...")
+# Per-player lookups shared with the pool workers (set by init_profile_worker)
+_player_sections = None
 
-complete_profiles = []
+def init_profile_worker(player_sections):
+    """Pool initializer: keep the prebuilt lookups in the worker instead of pickling them per task.
 
-for idx, player in profiles_df.iterrows():
-    player_id = player['player_id']
+    With the fork start method the dicts are inherited, not copied.
+    """
+    global _player_sections
+    _player_sections = player_sections
+
+def build_player_profile(player):
+    """Worker: assemble one profile from the player's row, career totals and prebuilt sections."""
+    (player_id, player_name, position, citizenship,
+     current_club_name, date_of_birth, height, foot) = player
+    (career_totals, transfer_history, season_performances, market_value_history,
+     injury_history, national_career, teammates) = (
+        lookup.get(player_id, default) for lookup, default in _player_sections
+    )
     
     complete_profile = {
         'player_id': player_id,
-        'player_name': player.get('player_name', ''),
+        'player_name': player_name,
         'detailed_content': f"""
-# {player.get('player_name', '')}
+# {player_name}
 
-{get_player_summary(player, performances_df, player_id)}
+{get_player_summary(position, citizenship, current_club_name, career_totals)}
 
-{get_transfer_history(player_id, transfer_df)}
+{transfer_history}
 
-{get_season_performances(player_id, performances_df)}
+{season_performances}
 
-{get_market_value_history(player_id, market_value_df)}
+{market_value_history}
 
-{get_injury_history(player_id, injuries_df)}
+{injury_history}
 
-{get_national_career(player_id, national_df)}
+{national_career}
 
-{get_teammates(player_id, teammates_df)}
+{teammates}
 
 *Data sourced from Transfermarkt - Comprehensive football database*
         """.strip(),
         'metadata': {
-            'position': player.get('position', ''),
-            'nationality': player.get('citizenship', ''),
-            'current_club': player.get('current_club_name', ''),
-            'birth_date': player.get('date_of_birth', ''),
-            'height': player.get('height', ''),
-            'foot': player.get('foot', '')
+            'position': position,
+            'nationality': citizenship,
+            'current_club': current_club_name,
+            'birth_date': date_of_birth,
+            'height': height,
+            'foot': foot
         }
     }
     
-    complete_profiles.append(complete_profile)
+    return complete_profile
+
+def build_profile_line(player):
+    """Worker: build one profile and serialize it as a UTF-8 JSON Lines record.
+
+    orjson writes missing values (NaN) as null, so the file is strict JSON.
+    """
+    return orjson.dumps(build_player_profile(player), option=orjson.OPT_APPEND_NEWLINE)
+
+if __name__ == "__main__":
+    print("BUILDING COMPLETE PLAYER PROFILES WITH ALL DATA...")
+    print("=" * 50)
+
+    print("Loading ALL datasets...")
+    profiles_df = load_data_safely(f"{base_path}/player_profiles/player_profiles.csv",
+                                   PROFILE_COLUMNS, PROFILE_DTYPES)
+    performances_df = load_data_safely(f"{base_path}/player_performances/player_performances.csv",
+                                       PERFORMANCE_COLUMNS, PERFORMANCE_DTYPES, PERFORMANCE_CATEGORIES)
+    transfer_df = load_data_safely(f"{base_path}/transfer_history/transfer_history.csv",
+                                   TRANSFER_COLUMNS, TRANSFER_DTYPES)
+    market_value_df = load_data_safely(f"{base_path}/player_market_value/player_market_value.csv",
+                                       MARKET_VALUE_COLUMNS, MARKET_VALUE_DTYPES)
+    injuries_df = load_data_safely(f"{base_path}/player_injuries/player_injuries.csv",
+                                   INJURY_COLUMNS, INJURY_DTYPES)
+    national_df = load_data_safely(f"{base_path}/player_national_performances/player_national_performances.csv",
+                                   NATIONAL_COLUMNS, NATIONAL_DTYPES)
+    teammates_df = load_data_safely(f"{base_path}/player_teammates_played_with/player_teammates_played_with.csv",
+                                    TEAMMATE_COLUMNS, TEAMMATE_DTYPES)
+
+    # Only profiled players get a profile, so every other dataset is cut down to them
+    # before any grouping
+    profile_ids = profiles_df['player_id'].unique()
+    performances_df = keep_profile_players(performances_df, profile_ids)
+    transfer_df = keep_profile_players(transfer_df, profile_ids)
+    market_value_df = keep_profile_players(market_value_df, profile_ids)
+    injuries_df = keep_profile_players(injuries_df, profile_ids)
+    national_df = keep_profile_players(national_df, profile_ids)
+    teammates_df = keep_profile_players(teammates_df, profile_ids)
+
+    print(f"Datasets loaded:")
+    print(f"   - Profiles: {len(profiles_df)} players")
+    print(f"   - Performances: {len(performances_df):,} season records")
+    print(f"   - Transfers: {len(transfer_df):,} transfer records")
+    print(f"   - Market Values: {len(market_value_df):,} value records")
+
+    # Build every player's section text in one pass per dataset
+    print("Building per-player sections...")
+    transfer_histories = get_transfer_histories(transfer_df)
+    season_performances = get_season_performances(performances_df)
+    market_value_histories = get_market_value_histories(market_value_df)
+    injury_histories = get_injury_histories(injuries_df)
+    national_careers = get_national_careers(national_df)
+    teammate_sections = get_teammates(teammates_df)
+
+    career_totals = get_career_totals(performances_df)
+
+    # (lookup, fallback) pairs in the order build_player_profile unpacks them
+    player_sections = [
+        (career_totals, NO_CAREER_TOTALS),
+        (transfer_histories, NO_TRANSFER_HISTORY),
+        (season_performances, NO_SEASON_PERFORMANCES),
+        (market_value_histories, NO_MARKET_VALUE_HISTORY),
+        (injury_histories, NO_INJURY_HISTORY),
+        (national_careers, NO_NATIONAL_CAREER),
+        (teammate_sections, NO_TEAMMATES),
+    ]
+
+    print(f"Creating COMPLETE profiles for {len(profiles_df)} players...")
+
+    # Profiles are streamed to disk as JSON Lines (one profile per line) as they are built
+    output_file = "data/processed/complete_player_profiles.jsonl"
+    profiles_written = 0
+    sample_profile = None
+
+    # Plain tuples in PROFILE_COLUMNS order: cheaper than iterrows() Series and picklable for the pool
+    player_rows = profiles_df[PROFILE_COLUMNS].itertuples(index=False, name=None)
 
-    # Progress indicator
-    if (idx + 1) % 10000 == 0:
-        print(f"Processed {idx + 1} players...")
+    # Workers build and serialize the profiles; imap (not imap_unordered) keeps
+    # the file in profile order, which the lexicon's term ids depend on
+    with open(output_file, 'wb') as f, \
+            Pool(os.cpu_count(), initializer=init_profile_worker, initargs=(player_sections,)) as pool:
+        for profile_line in pool.imap(build_profile_line, player_rows, chunksize=POOL_CHUNK_SIZE):
+            f.write(profile_line)
+            profiles_written += 1
+            if profiles_written == 11:
+                sample_profile = orjson.loads(profile_line)  # Get a different player
 
-print(f"Created {len(complete_profiles)} COMPLETE player profiles")
+            # Progress indicator
+            if profiles_written % 10000 == 0:
+                print(f"Processed {profiles_written} players...")
 
-# Save complete profiles
-output_file = "data/processed/complete_player_profiles.json"
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(complete_profiles, f, ensure_ascii=False, indent=2)
+    print(f"Created {profiles_written} COMPLETE player profiles")
 
-print(f"COMPLETE PROFILES READY!")
-print(f"Output file: {output_file}")
-print(f"Total profiles: {len(complete_profiles):,}")
+    print(f"COMPLETE PROFILES READY!")
+    print(f"Output file: {output_file}")
+    print(f"Total profiles: {profiles_written:,}")
 
-# Show a sample of a real player with data
-print(f"\nSAMPLE COMPLETE PROFILE:")
-print("=" * 60)
-sample_profile = complete_profiles[10]  # Get a different player
-print(sample_profile['detailed_content'][:1500] + "..." if len(sample_profile['detailed_content']) > 1500 else sample_profile['detailed_content'])
\ No newline at end of file
+    # Show a sample of a real player with data
+    print(f"\nSAMPLE COMPLETE PROFILE:")
+    print("=" * 60)
+    print(sample_profile['detailed_content'][:1500] + "..." if len(sample_profile['detailed_content']) > 1500 else sample_profile['detailed_content'])
\ No newline at end of file
@@ -1,29 +1,49 @@
 import json
+import os
 import re
-from collections import defaultdict
-
-print("📁 BUILDING FORWARD INDEX (TERM IDs)...")
-print("=" * 50)
-
-# ---------- Load documents ----------
-print("📥 Loading search documents...")
-with open("data/processed/complete_player_profiles.json", "r", encoding="utf-8") as f:
-    search_documents = json.load(f)
-print(f"✅ Loaded {len(search_documents)} documents")
-
-# ---------- Load lexicon (term_id mapping) ----------
-print("📥 Loading lexicon (term IDs)...")
-with open("data/index/lexicon_complete.json", "r", encoding="utf-8") as f:
-    lexicon_entries = json.load(f)
-
-token_to_id = {entry["token"]: entry["term_id"] for entry in lexicon_entries}
-print(f"✅ Loaded {len(token_to_id):,} tokens in lexicon")
-
-print("🏗️ Building forward index with term IDs...")
-
-forward_index = []  # list of doc objects
-
-for doc_idx, doc in enumerate(search_documents):
+from collections import Counter
+from itertools import chain, islice
+from multiprocessing import Pool
+
+import numpy as np
+
+# Documents handed to each worker at a time
+CHUNK_SIZE = 1000
+
+# ---------- Tokenizer (MUST MATCH build_complete_lexicons.tokenize, but yields bytes) ----------
+TOKEN_RE = re.compile(r"\b[a-z]+\b")
+
+# UTF-8 byte table: ASCII punctuation/whitespace -> space; letters, digits, '_' and
+# non-ASCII bytes are kept, so split() yields the same \w runs the regex sees
+WORD_BYTES = bytes(
+    b if b >= 128 or chr(b).isalnum() or b == ord("_") else ord(" ")
+    for b in range(256)
+)
+
+def tokenize_bytes(text: str):
+    """Same words as TOKEN_RE.findall(text.lower()), as UTF-8 bytes, via one bytes.translate pass."""
+    words = []
+    for piece in text.lower().encode("utf-8").translate(WORD_BYTES).split():
+        if piece.isalpha():
+            # All-ASCII letters
+            words.append(piece)
+        elif not piece.isascii():
+            # Non-ASCII runs keep the regex's Unicode word-boundary rules
+            words.extend(word.encode("ascii") for word in TOKEN_RE.findall(piece.decode("utf-8")))
+    return words
+
+# ---------- Per-document indexing (runs in the pool workers) ----------
+# token -> term_id, keyed on UTF-8 bytes (set by init_worker)
+token_to_id = None
+
+def init_worker(lexicon_token_to_id):
+    """Pool initializer: keep the lexicon mapping in the worker instead of pickling it per chunk."""
+    global token_to_id
+    token_to_id = lexicon_token_to_id
+
+def index_document(line: str):
+    """Build the forward-index entry for one JSON Lines profile."""
+    doc = json.loads(line)
     player_id = doc.get("player_id")          # this is your doc identifier
     player_name = doc.get("player_name", "")
 
@@ -31,36 +51,33 @@ for doc_idx, doc in enumerate(search_documents):
     text = doc.get("detailed_content", "")
     if not isinstance(text, str):
         text = str(text)
-    text = text.lower()
 
     # Tokenize
-    words = re.findall(r"\b[a-z]+\b", text)
+    words = tokenize_bytes(text)
 
-    # Count term frequencies and positions using tokens first
-    token_tf = defaultdict(int)
-    token_positions = defaultdict(list)
+    # Term frequencies come from Counter (C loop); positions are only collected for
+    # lexicon terms, and only the first 10 of each
+    token_tf = Counter(words)
+    token_positions = {word: [] for word in token_tf if word in token_to_id}
 
     for position, word in enumerate(words):
-        token_tf[word] += 1
-        token_positions[word].append(position)
+        positions = token_positions.get(word)
+        if positions is not None and len(positions) < 10:
+            positions.append(position)
 
     term_entries = []
     total_terms = 0
 
-    for token, tf in token_tf.items():
-        term_id = token_to_id.get(token)
-        if term_id is None:
-            continue
-
-        positions = token_positions[token]
+    for token, positions in token_positions.items():
+        tf = token_tf[token]
         term_entries.append({
-            "term_id": term_id,
+            "term_id": token_to_id[token],
             "tf": tf,
-            "positions": positions[:10],  # first 10 positions
+            "positions": positions,  # first 10 positions
         })
         total_terms += tf
 
-    doc_entry = {
+    return {
         "player_id": player_id,          # acts as doc id
         "player_name": player_name,
         "terms": term_entries,
@@ -68,45 +85,103 @@ for doc_idx, doc in enumerate(search_documents):
         "unique_terms": len(term_entries),
     }
 
-    forward_index.append(doc_entry)
-
-    if (doc_idx + 1) % 10000 == 0:
-        print(f"✅ Processed {doc_idx + 1} documents...")
-
-print("\n📊 FORWARD INDEX STATISTICS (TERM IDs):")
-print("=" * 40)
-doc_count = len(forward_index)
-total_terms_all = sum(d["total_terms"] for d in forward_index)
-total_unique_terms_all = sum(d["unique_terms"] for d in forward_index)
-avg_terms_per_doc = total_terms_all // doc_count if doc_count else 0
-avg_unique_terms_per_doc = total_unique_terms_all // doc_count if doc_count else 0
-
-print(f"  Documents indexed: {doc_count:,}")
-print(f"  Total terms: {total_terms_all:,}")
-print(f"  Total unique terms (per-doc sum): {total_unique_terms_all:,}")
-print(f"  Avg terms per document: {avg_terms_per_doc}")
-print(f"  Avg unique terms per document: {avg_unique_terms_per_doc}")
-
-# ---------- Save forward index (compact but readable) ----------
-print("\n💾 Saving forward index (TERM IDs)...")
-with open("data/index/forward_index_termid.json", "w", encoding="utf-8") as f:
-    json.dump(forward_index, f, ensure_ascii=False, indent=1, separators=(",", ":"))
-
-print("🎯 FORWARD INDEX WITH TERM IDs BUILT!")
-print("📁 Saved: data/index/forward_index_termid.json")
-
-# ---------- Sample output ----------
-print("\n👀 SAMPLE FORWARD INDEX ENTRIES (TERM IDs):")
-print("=" * 50)
-
-for doc in forward_index[:3]:
-    print(f"\n📄 Player / Doc: {doc['player_id']}")
-    print(f"  Player name: {doc['player_name']}")
-    print(f"  Total terms: {doc['total_terms']}")
-    print(f"  Unique terms: {doc['unique_terms']}")
-    sample_terms = doc["terms"][:5]
-    print("  Sample terms (term_id:tf@positions):")
-    for t in sample_terms:
-        print(f"    {t['term_id']}:{t['tf']}@{t['positions']}")
-
-print("\n✅ FORWARD INDEX READY FOR INVERTED INDEX BUILDING!")
+def index_documents(lines):
+    """Worker: index a chunk of JSON Lines profiles, keeping their order."""
+    return [index_document(line) for line in lines]
+
+# ---------- Forward index file (MUST MATCH add_document.py / build_inverted_index.py / search_engine.py) ----------
+# One uncompressed .npz of CSR arrays:
+#   player_ids, player_names ("" when missing), total_terms      one entry per document
+#   term_offsets[d]:term_offsets[d + 1]    document d's slice of term_ids / tfs
+#   position_offsets[t]:position_offsets[t + 1]    term entry t's slice of positions (first 10)
+FORWARD_INDEX_PATH = "data/index/forward_index.npz"
+
+def save_forward_index(path: str, forward_index: list):
+    """Write forward-index doc entries as the CSR arrays of forward_index.npz."""
+    terms = [term for doc in forward_index for term in doc["terms"]]
+    np.savez(
+        path,
+        player_ids=np.array([doc["player_id"] for doc in forward_index], dtype=np.int64),
+        player_names=np.array([doc["player_name"] if isinstance(doc["player_name"], str) else ""
+                               for doc in forward_index], dtype=str),
+        total_terms=np.array([doc["total_terms"] for doc in forward_index], dtype=np.int32),
+        term_offsets=np.cumsum([0] + [doc["unique_terms"] for doc in forward_index], dtype=np.int64),
+        term_ids=np.array([term["term_id"] for term in terms], dtype=np.int32),
+        tfs=np.array([term["tf"] for term in terms], dtype=np.int32),
+        position_offsets=np.cumsum([0] + [len(term["positions"]) for term in terms], dtype=np.int64),
+        positions=np.fromiter(chain.from_iterable(term["positions"] for term in terms), dtype=np.int32),
+    )
+
+def read_chunks(f, size):
+    """Yield lists of up to `size` lines from an open file."""
+    while True:
+        lines = list(islice(f, size))
+        if not lines:
+            return
+        yield lines
+
+if __name__ == "__main__":
+    print("📁 BUILDING FORWARD INDEX (TERM IDs)...")
+    print("=" * 50)
+
+    # ---------- Load lexicon (term_id mapping) ----------
+    print("📥 Loading lexicon (term IDs)...")
+    with open("data/index/lexicon.tokens", "rb") as f:
+        lexicon_tokens = f.read().decode("utf-8").splitlines()
+
+    # Keyed on UTF-8 bytes so tokenized words are looked up without decoding
+    lexicon_token_to_id = {token.encode("utf-8"): term_id for term_id, token in enumerate(lexicon_tokens)}
+    print(f"✅ Loaded {len(lexicon_token_to_id):,} tokens in lexicon")
+
+    print("🏗️ Building forward index with term IDs...")
+
+    forward_index = []  # list of doc objects
+
+    # Search documents are streamed from JSON Lines (one profile per line) to the
+    # workers in chunks; imap returns them in document order
+    with open("data/processed/complete_player_profiles.jsonl", "r", encoding="utf-8") as f, \
+            Pool(os.cpu_count(), initializer=init_worker, initargs=(lexicon_token_to_id,)) as pool:
+        for doc_entries in pool.imap(index_documents, read_chunks(f, CHUNK_SIZE)):
+            forward_index.extend(doc_entries)
+
+            if len(forward_index) % 10000 == 0:
+                print(f"✅ Processed {len(forward_index)} documents...")
+
+    print(f"✅ Loaded {len(forward_index)} documents")
+
+    print("\n📊 FORWARD INDEX STATISTICS (TERM IDs):")
+    print("=" * 40)
+    doc_count = len(forward_index)
+    total_terms_all = sum(d["total_terms"] for d in forward_index)
+    total_unique_terms_all = sum(d["unique_terms"] for d in forward_index)
+    avg_terms_per_doc = total_terms_all // doc_count if doc_count else 0
+    avg_unique_terms_per_doc = total_unique_terms_all // doc_count if doc_count else 0
+
+    print(f"  Documents indexed: {doc_count:,}")
+    print(f"  Total terms: {total_terms_all:,}")
+    print(f"  Total unique terms (per-doc sum): {total_unique_terms_all:,}")
+    print(f"  Avg terms per document: {avg_terms_per_doc}")
+    print(f"  Avg unique terms per document: {avg_unique_terms_per_doc}")
+
+    # ---------- Save forward index ----------
+    print("\n💾 Saving forward index (TERM IDs)...")
+    save_forward_index(FORWARD_INDEX_PATH, forward_index)
+
+    print("🎯 FORWARD INDEX WITH TERM IDs BUILT!")
+    print(f"📁 Saved: {FORWARD_INDEX_PATH}")
+
+    # ---------- Sample output ----------
+    print("\n👀 SAMPLE FORWARD INDEX ENTRIES (TERM IDs):")
+    print("=" * 50)
+
+    for doc in forward_index[:3]:
+        print(f"\n📄 Player / Doc: {doc['player_id']}")
+        print(f"  Player name: {doc['player_name']}")
+        print(f"  Total terms: {doc['total_terms']}")
+        print(f"  Unique terms: {doc['unique_terms']}")
+        sample_terms = doc["terms"][:5]
+        print("  Sample terms (term_id:tf@positions):")
+        for t in sample_terms:
+            print(f"    {t['term_id']}:{t['tf']}@{t['positions']}")
+
+    print("\n✅ FORWARD INDEX READY FOR INVERTED INDEX BUILDING!")
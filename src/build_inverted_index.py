@@ -1,65 +1,190 @@
 # build_inverted_index_termid.py
-import json
-from collections import defaultdict
-
-print("🔄 BUILDING MINIMAL INVERTED INDEX (TERM IDs)...")
-print("=" * 50)
-
-# Load forward index with term_ids
-print("📥 Loading forward index (TERM IDs)...")
-with open("data/index/forward_index_termid.json", "r", encoding="utf-8") as f:
-    forward_index = json.load(f)
-print(f"✅ Loaded {len(forward_index):,} documents from forward index")
-
-# Optional: load lexicon for term_id -> token mapping (only for debugging / printing)
-print("📥 Loading lexicon for term_id -> token mapping...")
-with open("data/index/lexicon_complete.json", "r", encoding="utf-8") as f:
-    lexicon_entries = json.load(f)
-
-termid_to_token = {entry["term_id"]: entry["token"] for entry in lexicon_entries}
-print(f"✅ Loaded {len(termid_to_token):,} term IDs")
-
-print("🏗️ Building inverted index (TERM IDs)...")
-
-# Inverted index: term_id -> {doc_id: {tf, positions}}
-inverted_index = defaultdict(lambda: defaultdict(dict))
-
-# DF: how many docs contain each term_id
-term_document_frequency = defaultdict(int)
-
-for doc_data in forward_index:
-    doc_id = doc_data["player_id"]          # this is your document identifier
-    terms = doc_data["terms"]               # list of {term_id, tf, positions}
-
-    for term_entry in terms:
-        term_id = term_entry["term_id"]
-        tf = term_entry["tf"]
-        positions = term_entry["positions"]
-
-        inverted_index[term_id][doc_id] = {
-            "tf": tf,
-            "positions": positions,
-        }
-        term_document_frequency[term_id] += 1
-
-print("💾 Saving minimal inverted index (TERM IDs)...")
-
-# Convert nested defaultdicts to plain dicts and serialize
-inverted_index_dict = {int(tid): dict(docs) for tid, docs in inverted_index.items()}
-output = {
-    "term_document_frequency": {int(tid): df for tid, df in term_document_frequency.items()},
-    "inverted_index": inverted_index_dict,
-}
-
-with open("data/index/inverted_index_termid.json", "w", encoding="utf-8") as f:
-    json.dump(output, f, ensure_ascii=False, indent=1, separators=(",", ":"))
-
-print("🎯 MINIMAL INVERTED INDEX (TERM IDs) BUILT!")
-print("📁 Saved: data/index/inverted_index_termid.json")
-
-# Optional: small debug sample
-print("\n👀 SAMPLE TERMS:")
-for term_id in list(inverted_index_dict.keys())[:5]:
-    token = termid_to_token.get(term_id, f"<term_{term_id}>")
-    docs = inverted_index_dict[term_id]
-    print(f"  term_id={term_id}, token='{token}', docs={len(docs)}")
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+# Inverted index file: CSR arrays grouped by term, in one uncompressed .npz
+#   term_ids, term_document_frequency      one entry per term (ascending term_id)
+#   posting_offsets[t]:posting_offsets[t + 1]      term t's slice of doc_ids / tfs (document order)
+#   position_offsets[p]:position_offsets[p + 1]    posting p's slice of positions (first 10)
+INVERTED_INDEX_PATH = "data/index/inverted_index.npz"
+
+# External sort (BSBI): postings are streamed from the forward index into
+# SHARD_COUNT term_id-range shards, then each shard is sorted on its own, so only
+# one block of documents or one shard is ever in memory
+SHARD_COUNT = 16
+BLOCK_DOCS = 10000
+
+# Per-posting columns spilled to each shard, and their dtypes
+SHARD_COLUMNS = {"term_ids": np.int32, "doc_ids": np.int64, "tfs": np.int32,
+                 "position_counts": np.int64, "positions": np.int32}
+
+# ---------- .npz streaming helpers ----------
+
+def open_npz_member(npz, name):
+    """Open one array of an uncompressed .npz as a stream positioned at its data; returns (stream, dtype)."""
+    stream = npz.zip.open(f"{name}.npy")
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        _, _, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        _, _, dtype = np.lib.format.read_array_header_2_0(stream)
+    return stream, dtype
+
+def read_values(stream, dtype, count):
+    """Read the next `count` values of an array stream."""
+    return np.frombuffer(stream.read(count * dtype.itemsize), dtype=dtype)
+
+def write_npz_member(npz_file, name, dtype, length, paths):
+    """Write a 1-D array member whose raw data is the concatenation of the files in `paths`."""
+    with npz_file.open(f"{name}.npy", "w", force_zip64=True) as out:
+        np.lib.format.write_array_header_1_0(out, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": (length,),
+        })
+        for path in paths:
+            with open(path, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    out.write(chunk)
+
+def append_raw(path, values, dtype):
+    """Append values to a raw binary spill file."""
+    with open(path, "ab") as f:
+        f.write(np.asarray(values, dtype=dtype).tobytes())
+
+if __name__ == "__main__":
+    print("🔄 BUILDING MINIMAL INVERTED INDEX (TERM IDs)...")
+    print("=" * 50)
+
+    # Optional: load lexicon for term_id -> token mapping (only for debugging / printing)
+    print("📥 Loading lexicon for term_id -> token mapping...")
+    with open("data/index/lexicon.tokens", "rb") as f:
+        termid_to_token = dict(enumerate(f.read().decode("utf-8").splitlines()))
+    print(f"✅ Loaded {len(termid_to_token):,} term IDs")
+
+    # Term ids are split into contiguous ranges so shard outputs concatenate in term order
+    shard_width = max(-(-len(termid_to_token) // SHARD_COUNT), 1)
+
+    with tempfile.TemporaryDirectory(dir="data/index") as work_dir:
+        def spill_path(kind, shard, column):
+            return os.path.join(work_dir, f"{kind}_{shard:03d}_{column}.bin")
+
+        # ---------- Pass 1: stream forward-index postings into term-range shards ----------
+        # Forward index CSR arrays (MUST MATCH build_forward_index.py); only the
+        # per-document arrays are read whole
+        print("📥 Streaming forward index (TERM IDs) into shards...")
+        with np.load("data/index/forward_index.npz") as forward_index:
+            player_ids = forward_index["player_ids"]
+            term_offsets = forward_index["term_offsets"]
+            streams = {name: open_npz_member(forward_index, name)
+                       for name in ("term_ids", "tfs", "position_offsets", "positions")}
+
+            # position_offsets has one more entry than term_ids; keep the previous block's last value
+            position_offsets_stream, position_offsets_dtype = streams["position_offsets"]
+            block_position_start = read_values(position_offsets_stream, position_offsets_dtype, 1)[0]
+
+            for doc_start in range(0, len(player_ids), BLOCK_DOCS):
+                doc_end = min(doc_start + BLOCK_DOCS, len(player_ids))
+                entry_count = term_offsets[doc_end] - term_offsets[doc_start]
+
+                # One posting per forward-index term entry: (term_id, doc_id, tf, positions)
+                term_ids = read_values(*streams["term_ids"], entry_count)
+                tfs = read_values(*streams["tfs"], entry_count)
+                position_ends = read_values(position_offsets_stream, position_offsets_dtype, entry_count)
+                position_counts = np.diff(position_ends, prepend=block_position_start)
+                block_position_start = position_ends[-1] if entry_count else block_position_start
+                positions = read_values(*streams["positions"], int(position_counts.sum()))
+                doc_ids = np.repeat(player_ids[doc_start:doc_end], np.diff(term_offsets[doc_start:doc_end + 1]))
+
+                shards = np.minimum(term_ids // shard_width, SHARD_COUNT - 1)
+                position_shards = np.repeat(shards, position_counts)
+                for shard in np.unique(shards).tolist():
+                    mask = shards == shard
+                    append_raw(spill_path("postings", shard, "term_ids"), term_ids[mask], SHARD_COLUMNS["term_ids"])
+                    append_raw(spill_path("postings", shard, "doc_ids"), doc_ids[mask], SHARD_COLUMNS["doc_ids"])
+                    append_raw(spill_path("postings", shard, "tfs"), tfs[mask], SHARD_COLUMNS["tfs"])
+                    append_raw(spill_path("postings", shard, "position_counts"), position_counts[mask],
+                               SHARD_COLUMNS["position_counts"])
+                    append_raw(spill_path("postings", shard, "positions"), positions[position_shards == shard],
+                               SHARD_COLUMNS["positions"])
+
+                print(f"✅ Processed {doc_end} documents...")
+
+            for stream, _ in streams.values():
+                stream.close()
+        print(f"✅ Loaded {len(player_ids):,} documents from forward index")
+
+        # ---------- Pass 2: sort each shard by term and append it to the output columns ----------
+        print("🏗️ Building inverted index (TERM IDs)...")
+        output_dtypes = {"term_ids": np.int32, "term_document_frequency": np.int32,
+                         "posting_offsets": np.int64, "doc_ids": np.int64, "tfs": np.int32,
+                         "position_offsets": np.int64, "positions": np.int32}
+        output_lengths = dict.fromkeys(output_dtypes, 0)
+        output_paths = {name: [] for name in output_dtypes}
+        posting_base = position_base = 0
+        sample_terms = []
+
+        for shard in range(SHARD_COUNT):
+            if not os.path.exists(spill_path("postings", shard, "term_ids")):
+                continue
+            columns = {column: np.fromfile(spill_path("postings", shard, column), dtype=dtype)
+                       for column, dtype in SHARD_COLUMNS.items()}
+
+            # Group postings by term; the stable sort keeps each term's postings in document order
+            order = np.argsort(columns["term_ids"], kind="stable")
+            term_ids, term_starts, term_document_frequency = np.unique(
+                columns["term_ids"][order], return_index=True, return_counts=True
+            )
+
+            # Gather each posting's positions slice in the new posting order
+            position_counts = columns["position_counts"]
+            shard_position_offsets = np.concatenate(([0], np.cumsum(position_counts)))
+            sorted_position_counts = position_counts[order]
+            sorted_position_offsets = np.concatenate(([0], np.cumsum(sorted_position_counts)))
+            position_index = (np.repeat(shard_position_offsets[:-1][order] - sorted_position_offsets[:-1],
+                                        sorted_position_counts)
+                              + np.arange(sorted_position_offsets[-1]))
+
+            shard_output = {
+                "term_ids": term_ids,
+                "term_document_frequency": term_document_frequency,
+                "posting_offsets": term_starts + posting_base,
+                "doc_ids": columns["doc_ids"][order],
+                "tfs": columns["tfs"][order],
+                "position_offsets": sorted_position_offsets[:-1] + position_base,
+                "positions": columns["positions"][position_index],
+            }
+            for name, values in shard_output.items():
+                path = spill_path("output", shard, name)
+                append_raw(path, values, output_dtypes[name])
+                output_paths[name].append(path)
+                output_lengths[name] += len(values)
+
+            posting_base += len(order)
+            position_base += int(sorted_position_offsets[-1])
+            sample_terms.extend(zip(term_ids[:5 - len(sample_terms)].tolist(),
+                                    term_document_frequency[:5 - len(sample_terms)].tolist()))
+
+        # Closing entries of the two offset arrays
+        for name, total in (("posting_offsets", posting_base), ("position_offsets", position_base)):
+            path = spill_path("output", SHARD_COUNT, name)
+            append_raw(path, [total], output_dtypes[name])
+            output_paths[name].append(path)
+            output_lengths[name] += 1
+
+        print("💾 Saving minimal inverted index (TERM IDs)...")
+        with zipfile.ZipFile(INVERTED_INDEX_PATH, "w", zipfile.ZIP_STORED, allowZip64=True) as npz_file:
+            for name, dtype in output_dtypes.items():
+                write_npz_member(npz_file, name, dtype, output_lengths[name], output_paths[name])
+
+    print("🎯 MINIMAL INVERTED INDEX (TERM IDs) BUILT!")
+    print(f"📁 Saved: {INVERTED_INDEX_PATH}")
+
+    # Optional: small debug sample
+    print("\n👀 SAMPLE TERMS:")
+    for term_id, df in sample_terms:
+        token = termid_to_token.get(term_id, f"<term_{term_id}>")
+        print(f"  term_id={term_id}, token='{token}', docs={df}")
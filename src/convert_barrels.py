@@ -0,0 +1,165 @@
+# convert_barrels.py
+# BARREL STORE CONVERSION - Move barrels between JSON files and the SQLite barrel store
+#
+# Usage:
+#   python src/convert_barrels.py import   # barrels/barrel_XXX.json -> barrels/barrels.db
+#   python src/convert_barrels.py export   # barrels/barrels.db -> barrels/barrel_XXX.json
+#
+# Older {"postings": {player_id: {"tf": tf}}} barrels are converted to doc_ids/tfs arrays on import.
+# JSON barrels keep the {"token", "df", "doc_ids", "tfs"} layout; tokens come from the lexicon on export.
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import orjson
+
+# ---------- PATHS ----------
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+INDEX_DIR = os.path.join(PROJECT_ROOT, 'data', 'index')
+BARREL_DIR = os.path.join(INDEX_DIR, 'barrels')
+
+LEXICON_TOKENS_PATH = os.path.join(INDEX_DIR, 'lexicon.tokens')
+BARREL_DB_PATH = os.path.join(BARREL_DIR, 'barrels.db')
+
+# ---------- BARREL STORE (MUST MATCH add_document.py / search_engine.py) ----------
+
+# One row per term: (barrel_id, term_id) -> little-endian blob [int32 df, int32 doc_ids..., uint16 tfs...],
+# doc_ids sorted ascending with tfs in the same order
+BARREL_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    barrel_id INTEGER NOT NULL,
+    term_id INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (barrel_id, term_id)
+) WITHOUT ROWID
+"""
+DOC_ID_DTYPE = np.dtype('<i4')
+TF_DTYPE = np.dtype('<u2')
+
+def barrel_id(barrel_name: str) -> int:
+    return int(barrel_name.rsplit('_', 1)[1])
+
+def read_json(path: str):
+    """Parse a JSON file with orjson, falling back to json for bare NaN values."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+def encode_postings(df: int, doc_ids, tfs) -> bytes:
+    """Pack a term's df and parallel doc_ids/tfs into one postings blob."""
+    tfs = np.asarray(tfs)
+    if len(tfs) and tfs.max() > np.iinfo(TF_DTYPE).max:
+        raise ValueError(f"term frequency {tfs.max()} does not fit in a postings blob")
+    return (np.array([df], dtype=DOC_ID_DTYPE).tobytes()
+            + np.asarray(doc_ids, dtype=DOC_ID_DTYPE).tobytes()
+            + tfs.astype(TF_DTYPE).tobytes())
+
+def decode_postings(data: bytes):
+    """Unpack a postings blob into (df, doc_ids, tfs); the arrays are views over `data`."""
+    n = (len(data) - DOC_ID_DTYPE.itemsize) // (DOC_ID_DTYPE.itemsize + TF_DTYPE.itemsize)
+    df = int(np.frombuffer(data, dtype=DOC_ID_DTYPE, count=1)[0])
+    doc_ids = np.frombuffer(data, dtype=DOC_ID_DTYPE, count=n, offset=DOC_ID_DTYPE.itemsize)
+    tfs = np.frombuffer(data, dtype=TF_DTYPE, count=n, offset=DOC_ID_DTYPE.itemsize * (1 + n))
+    return df, doc_ids, tfs
+
+def read_lexicon_tokens():
+    with open(LEXICON_TOKENS_PATH, 'rb') as f:
+        return f.read().decode('utf-8').splitlines()
+
+# ---------- IMPORT ----------
+
+def to_parallel_postings(term_data: dict) -> dict:
+    """Convert a {"postings": {player_id: {"tf": tf}}} entry to sorted doc_ids/tfs arrays."""
+    if 'postings' not in term_data:
+        return term_data
+    postings = sorted((int(doc_id), info['tf']) for doc_id, info in term_data['postings'].items())
+    return {
+        'token': term_data['token'],
+        'df': term_data['df'],
+        'doc_ids': [doc_id for doc_id, _ in postings],
+        'tfs': [tf for _, tf in postings]
+    }
+
+def import_barrels():
+    """Load every JSON barrel into the barrel store."""
+    barrel_files = sorted(name for name in os.listdir(BARREL_DIR)
+                          if name.startswith('barrel_') and name.endswith('.json'))
+
+    conn = sqlite3.connect(BARREL_DB_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(BARREL_STORE_SCHEMA)
+
+    total_terms = 0
+    with conn:
+        for barrel_file in barrel_files:
+            barrel_data = read_json(os.path.join(BARREL_DIR, barrel_file))
+
+            bid = barrel_id(barrel_file[:-len('.json')])
+            rows = []
+            for term_id_str, term_data in barrel_data['inverted_index'].items():
+                term_data = to_parallel_postings(term_data)
+                rows.append((bid, int(term_id_str),
+                             encode_postings(term_data['df'], term_data['doc_ids'], term_data['tfs'])))
+            conn.executemany(
+                "INSERT OR REPLACE INTO postings (barrel_id, term_id, data) VALUES (?, ?, ?)", rows
+            )
+            total_terms += len(barrel_data['inverted_index'])
+    conn.close()
+
+    print(f"[done] Imported {len(barrel_files)} barrels ({total_terms:,} terms) into {BARREL_DB_PATH}")
+
+# ---------- EXPORT ----------
+
+def export_barrels():
+    """Write the barrel store back out as barrel_XXX.json files."""
+    if not os.path.exists(BARREL_DB_PATH):
+        print(f"[error] Barrel store not found: {BARREL_DB_PATH}")
+        return
+
+    term_tokens = read_lexicon_tokens()
+    conn = sqlite3.connect(BARREL_DB_PATH)
+    barrels = {}
+    for bid, term_id, data in conn.execute(
+            "SELECT barrel_id, term_id, data FROM postings ORDER BY barrel_id, term_id"):
+        df, doc_ids, tfs = decode_postings(data)
+        barrels.setdefault(bid, {})[str(term_id)] = {
+            'token': term_tokens[term_id],
+            'df': df,
+            'doc_ids': doc_ids.tolist(),
+            'tfs': tfs.tolist()
+        }
+    conn.close()
+
+    for bid, inverted_index in barrels.items():
+        barrel_name = f"barrel_{bid:03d}"
+        barrel_data = {
+            'metadata': {
+                'term_count': len(inverted_index),
+                'posting_count': sum(len(term_data['doc_ids']) for term_data in inverted_index.values()),
+                'barrel_name': barrel_name
+            },
+            'inverted_index': inverted_index
+        }
+        with open(os.path.join(BARREL_DIR, f"{barrel_name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(barrel_data, f, ensure_ascii=False)
+
+    print(f"[done] Exported {len(barrels)} barrels to {BARREL_DIR}")
+
+# ---------- CLI ----------
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "import":
+        import_barrels()
+    elif command == "export":
+        export_barrels()
+    else:
+        print("Usage: python convert_barrels.py [import|export]")
+        sys.exit(1)
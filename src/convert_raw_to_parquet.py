@@ -0,0 +1,42 @@
+# convert_raw_to_parquet.py
+# RAW DATA CONVERSION - Write a Parquet copy next to every raw CSV table
+#
+# Usage:
+#   python src/convert_raw_to_parquet.py   # data/raw/<table>/<table>.csv -> data/raw/<table>/<table>.parquet
+#
+# The CSVs are parsed once with the same pandas inference the builders used, so the
+# Parquet tables load back with identical columns and dtypes. build_detailed_profiles.py
+# and reduce_dataset.py read the Parquet copy when it exists and fall back to the CSV.
+# Re-run after replacing any raw CSV.
+import os
+
+import pandas as pd
+
+# ---------- PATHS ----------
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+RAW_DATA_DIR = os.path.join(PROJECT_ROOT, 'data', 'raw')
+
+# ---------- CONVERSION ----------
+
+def convert_table(csv_path: str) -> str:
+    """Parse one CSV table and write it as Parquet beside it (MUST MATCH reduce_dataset.write_parquet_copy)."""
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    df = pd.read_csv(csv_path, low_memory=False)
+    df.to_parquet(parquet_path, index=False)
+    print(f"  {os.path.relpath(csv_path, RAW_DATA_DIR)}: {len(df):,} rows -> {os.path.basename(parquet_path)}")
+    return parquet_path
+
+if __name__ == "__main__":
+    print(f"Converting raw CSV tables in {RAW_DATA_DIR} to Parquet...")
+    converted = 0
+    for folder in sorted(os.listdir(RAW_DATA_DIR)):
+        folder_path = os.path.join(RAW_DATA_DIR, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in sorted(os.listdir(folder_path)):
+            if filename.endswith('.csv'):
+                convert_table(os.path.join(folder_path, filename))
+                converted += 1
+    print(f"[done] Converted {converted} tables")
@@ -1,4 +1,7 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import os
 
 # Configuration
@@ -6,20 +9,76 @@ TARGET_PLAYERS = 10000
 RAW_DATA_DIR = os.path.join('..', 'data', 'raw')
 OUTPUT_DIR = os.path.join('..', 'data', 'raw_reduced')
 
+# Rows read, filtered and written at a time; no table is ever held whole in memory
+CHUNK_ROWS = 200_000
+
 # Create output directory
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+def iter_table(csv_path):
+    """Yield a raw table in chunks, preferring the Parquet copy from convert_raw_to_parquet.py.
+
+    CSV cells are kept as text so every chunk is written back exactly as read.
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    if os.path.exists(parquet_path):
+        parquet_file = pq.ParquetFile(parquet_path)
+        empty = True
+        for batch in parquet_file.iter_batches(batch_size=CHUNK_ROWS):
+            empty = False
+            yield batch.to_pandas()
+        if empty:
+            yield parquet_file.schema_arrow.empty_table().to_pandas()
+    else:
+        yield from pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS)
+
+def player_mask(column, player_ids):
+    """Semi-join mask: which rows of `column` hold one of the `player_ids` (an int64 arrow array).
+
+    Text ids are cast to int64 by arrow in C; anything the cast rejects (blanks,
+    "123.0", ...) falls back to pd.to_numeric, and unparseable ids never match.
+    """
+    values = pa.array(column)
+    try:
+        values = pc.cast(values, pa.int64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        values = pa.array(pd.to_numeric(column, errors='coerce'))
+    return pc.is_in(values, value_set=player_ids).fill_null(False).to_numpy(zero_copy_only=False)
+
+def write_chunk(chunk, output_path, first):
+    """Write the first chunk of a table with its header, append the rest."""
+    chunk.to_csv(output_path, mode='w' if first else 'a', header=first, index=False)
+
+def write_parquet_copy(csv_path):
+    """Write the Parquet copy the builders prefer next to a reduced CSV.
+
+    Reduced tables only hold the selected players, so the finished CSV is
+    re-parsed whole with the same pandas inference as convert_raw_to_parquet.py
+    (MUST MATCH): text chunks carry no column types of their own.
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    pd.read_csv(csv_path, low_memory=False).to_parquet(parquet_path, index=False)
+    return parquet_path
+
 print(f"Reducing dataset to {TARGET_PLAYERS} players...")
 
 # Step 1: Load player_profiles and select 10,000 players
 print("\nStep 1: Loading player_profiles.csv...")
 player_profiles_path = os.path.join(RAW_DATA_DIR, 'player_profiles', 'player_profiles.csv')
-df_profiles = pd.read_csv(player_profiles_path)
-print(f"Original player count: {len(df_profiles)}")
 
 # Select first 10,000 players (you can change this to random sampling if needed)
-df_profiles_reduced = df_profiles.head(TARGET_PLAYERS)
-selected_player_ids = set(df_profiles_reduced['player_id'].values)
+original_player_count = 0
+profile_chunks = []
+for chunk in iter_table(player_profiles_path):
+    kept = max(TARGET_PLAYERS - original_player_count, 0)
+    if kept or not profile_chunks:
+        profile_chunks.append(chunk.head(kept))
+    original_player_count += len(chunk)
+print(f"Original player count: {original_player_count}")
+
+df_profiles_reduced = pd.concat(profile_chunks)
+# Numeric ids for the semi-join below, whatever the source column type
+selected_player_ids = pa.array(pd.to_numeric(df_profiles_reduced['player_id']).unique(), type=pa.int64())
 print(f"Selected {len(selected_player_ids)} unique player IDs")
 
 # Save reduced player_profiles
@@ -27,7 +86,7 @@ output_profiles_dir = os.path.join(OUTPUT_DIR, 'player_profiles')
 os.makedirs(output_profiles_dir, exist_ok=True)
 output_path = os.path.join(output_profiles_dir, 'player_profiles.csv')
 df_profiles_reduced.to_csv(output_path, index=False)
-print(f"Saved: {output_path}")
+print(f"Saved: {output_path} (+ {os.path.basename(write_parquet_copy(output_path))})")
 
 # Step 2: Filter all other CSV files based on selected player IDs
 csv_files = [
@@ -49,19 +108,20 @@ for folder, filename, player_col in csv_files:
         continue
     
     print(f"\nProcessing {filename}...")
-    df = pd.read_csv(input_path)
-    print(f"  Original rows: {len(df)}")
-    
-    # Filter by selected player IDs
-    df_filtered = df[df[player_col].isin(selected_player_ids)]
-    print(f"  Filtered rows: {len(df_filtered)}")
-    
-    # Save filtered data
     output_folder = os.path.join(OUTPUT_DIR, folder)
     os.makedirs(output_folder, exist_ok=True)
     output_path = os.path.join(output_folder, filename)
-    df_filtered.to_csv(output_path, index=False)
-    print(f"  Saved: {output_path}")
+
+    # Filter by selected player IDs (semi-join), one chunk at a time
+    original_rows = filtered_rows = 0
+    for i, chunk in enumerate(iter_table(input_path)):
+        original_rows += len(chunk)
+        chunk = chunk[player_mask(chunk[player_col], selected_player_ids)]
+        write_chunk(chunk, output_path, first=(i == 0))
+        filtered_rows += len(chunk)
+    print(f"  Original rows: {original_rows}")
+    print(f"  Filtered rows: {filtered_rows}")
+    print(f"  Saved: {output_path} (+ {os.path.basename(write_parquet_copy(output_path))})")
 
 # Step 3: Copy team-related CSV files (not filtered by players)
 print("\nStep 3: Copying team-related files...")
@@ -79,15 +139,15 @@ for folder, filename in team_files:
         continue
     
     print(f"\nCopying {filename}...")
-    df = pd.read_csv(input_path)
-    print(f"  Rows: {len(df)}")
-    
-    # Save to output directory
     output_folder = os.path.join(OUTPUT_DIR, folder)
     os.makedirs(output_folder, exist_ok=True)
     output_path = os.path.join(output_folder, filename)
-    df.to_csv(output_path, index=False)
-    print(f"  Saved: {output_path}")
+    rows = 0
+    for i, chunk in enumerate(iter_table(input_path)):
+        write_chunk(chunk, output_path, first=(i == 0))
+        rows += len(chunk)
+    print(f"  Rows: {rows}")
+    print(f"  Saved: {output_path} (+ {os.path.basename(write_parquet_copy(output_path))})")
 
 print("\n" + "="*60)
 print(f"Dataset reduction complete!")
@@ -5,8 +5,14 @@ import json
 import math
 import os
 import re
+import sqlite3
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import orjson
 
 # ---------- CONFIG & PATHS ----------
 
@@ -14,11 +20,17 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 INDEX_DIR = os.path.join(PROJECT_ROOT, "data", "index")
 BARREL_DIR = os.path.join(INDEX_DIR, "barrels")
-LEXICON_PATH = os.path.join(INDEX_DIR, "lexicon_complete.json")
-FORWARD_INDEX_PATH = os.path.join(INDEX_DIR, "forward_index_termid.json")
+LEXICON_TOKENS_PATH = os.path.join(INDEX_DIR, "lexicon.tokens")
+LEXICON_DFS_PATH = os.path.join(INDEX_DIR, "lexicon.dfs")
+FORWARD_INDEX_PATH = os.path.join(INDEX_DIR, "forward_index.npz")
 TERM_TO_BARREL_MAP_PATH = os.path.join(BARREL_DIR, "term_to_barrel_map.json")
+BARREL_DB_PATH = os.path.join(BARREL_DIR, "barrels.db")
 MARKET_VALUE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "raw", "player_latest_market_value", "player_latest_market_value.csv")
-PROFILE_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "complete_player_profiles.json")
+PROFILE_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "complete_player_profiles.jsonl")
+
+# Barrel store pages are read through a memory map of up to this many bytes, so hot
+# postings stay in the OS page cache instead of being copied through SQLite's own cache
+BARREL_STORE_MMAP_BYTES = 1 << 30
 
 # BM25 parameters
 K1 = 1.2
@@ -35,7 +47,7 @@ NON_NAME_MATCH_PENALTY = 1.5
 
 # ---------- TEXT NORMALIZATION ----------
 
-COMPREHENSIVE_STOP_WORDS = {
+COMPREHENSIVE_STOP_WORDS = frozenset({
     "the", "and", "in", "for", "with", "on", "at", "from", "by", "as", "is", "was",
     "are", "were", "be", "been", "have", "has", "had", "to", "of", "a", "an", "that",
     "this", "these", "those", "it", "its", "or", "but", "not", "what", "which", "who",
@@ -50,34 +62,56 @@ COMPREHENSIVE_STOP_WORDS = {
     # Stemmed versions and other universal terms
     "data", "teammat", "sourc", "career", "assist", "app", "minut",
     "available", "national", "significant", "teammate", "transfer", "goal"
-}
+})
+
+# Query words (MUST MATCH the lexicon tokenizer in build_complete_lexicons.py)
+_TOKEN_RE = re.compile(r"\b[a-z]+\b")
+
+# UTF-8 byte table: ASCII punctuation/whitespace -> space; letters, digits, '_' and
+# non-ASCII bytes are kept, so split() yields the same \w runs the regex sees
+_WORD_BYTES = bytes(
+    b if b >= 128 or chr(b).isalnum() or b == ord("_") else ord(" ")
+    for b in range(256)
+)
+
+# Name words are plain [a-z]+ runs: every other byte (including all non-ASCII) -> space
+_NAME_LETTER_BYTES = bytes(b if ord("a") <= b <= ord("z") else ord(" ") for b in range(256))
+
+def tokenize(text: str):
+    """Same words as _TOKEN_RE.findall(text.lower()), via one bytes.translate pass."""
+    words = []
+    for piece in text.lower().encode("utf-8").translate(_WORD_BYTES).split():
+        if piece.isalpha():
+            # All-ASCII letters
+            words.append(piece.decode("ascii"))
+        elif not piece.isascii():
+            # Non-ASCII runs keep the regex's Unicode word-boundary rules
+            words.extend(_TOKEN_RE.findall(piece.decode("utf-8")))
+    return words
 
+_TWO_CHAR_SUFFIXES = frozenset(("ed", "es"))
+
+# Names share most of their words, so stems are memoized
+@lru_cache(maxsize=None)
 def simple_stemmer(word: str) -> str:
-    if word.endswith("ing") and len(word) > 5:
+    # Strips -ing (len > 5), -ed/-es (len > 4) or -s (len > 3), checked in that order
+    n = len(word)
+    if n <= 3:
+        return word
+    if n > 5 and word[-3:] == "ing":
         return word[:-3]
-    elif word.endswith("ed") and len(word) > 4:
-        return word[:-2]
-    elif word.endswith("es") and len(word) > 4:
+    if n > 4 and word[-2:] in _TWO_CHAR_SUFFIXES:
         return word[:-2]
-    elif word.endswith("s") and len(word) > 3:
+    if word[-1] == "s":
         return word[:-1]
     return word
 
-def normalize_and_tokenize(text: str):
-    text = text.lower()
-    tokens = re.findall(r"\b[a-z]+\b", text)
-    result = []
-    for w in tokens:
-        if w in COMPREHENSIVE_STOP_WORDS or len(w) <= 2:
-            continue
-        result.append(simple_stemmer(w))
-    return result
-
 def normalize_name_tokens(value: str):
     if not isinstance(value, str):
         return []
-    tokens = re.findall(r"[a-z]+", value.lower())
-    return [simple_stemmer(tok) for tok in tokens if tok]
+    # Same words as re.findall(r"[a-z]+", value.lower())
+    return [simple_stemmer(tok.decode("ascii"))
+            for tok in value.lower().encode("utf-8").translate(_NAME_LETTER_BYTES).split()]
 
 def build_name_metadata(name: str):
     tokens = normalize_name_tokens(name)
@@ -114,49 +148,99 @@ def load_market_values(path: str):
         return {}
     return {pid: info[1] for pid, info in values.items()}
 
+def parse_json(raw: bytes):
+    """Parse JSON with orjson, falling back to json for bare NaN values."""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Older pandas-built profiles can contain NaN literals
+        return json.loads(raw)
+
 def load_profile_lengths(path: str):
+    lengths = {}
     try:
-        with open(path, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
+        with open(path, "rb") as handle:
+            # One profile per line (JSON Lines)
+            for line in handle:
+                entry = parse_json(line)
+                player_id = entry.get("player_id")
+                if not isinstance(player_id, int):
+                    continue
+                detailed = entry.get("detailed_content")
+                if isinstance(detailed, str) and detailed:
+                    lengths[player_id] = len(detailed)
     except FileNotFoundError:
         print(f"[warn] Profile data file not found at {path}")
         return {}
-
-    lengths = {}
-    for entry in data:
-        player_id = entry.get("player_id")
-        if not isinstance(player_id, int):
-            continue
-        detailed = entry.get("detailed_content")
-        if isinstance(detailed, str) and detailed:
-            lengths[player_id] = len(detailed)
     return lengths
 
 # ---------- LOAD STATIC INDEXES (NOT INVERTED INDEX) ----------
 
 print("[init] Loading lexicon...")
-with open(LEXICON_PATH, "r", encoding="utf-8") as f:
-    lexicon_entries = json.load(f)
-token_to_id = {entry["token"]: entry["term_id"] for entry in lexicon_entries}
-termid_to_token = {entry["term_id"]: entry["token"] for entry in lexicon_entries}
-term_document_frequency = {entry["term_id"]: entry["df"] for entry in lexicon_entries}
+# Parallel arrays indexed by term_id (MUST MATCH build_complete_lexicons.py)
+with open(LEXICON_TOKENS_PATH, "rb") as f:
+    termid_to_token = f.read().decode("utf-8").splitlines()
+term_document_frequency = np.fromfile(LEXICON_DFS_PATH, dtype=np.int32).tolist()
+token_to_id = {token: term_id for term_id, token in enumerate(termid_to_token)}
 print(f"[done] Lexicon loaded: {len(token_to_id):,} tokens")
 
 print("[init] Loading forward index...")
-with open(FORWARD_INDEX_PATH, "r", encoding="utf-8") as f:
-    forward_index = json.load(f)
-doc_by_id = {doc["player_id"]: doc for doc in forward_index}
-N = len(doc_by_id)
-avg_doc_len = sum(d["total_terms"] for d in forward_index) / N if N > 0 else 0.0
-name_metadata = {doc_id: build_name_metadata(doc.get("player_name"))
-                 for doc_id, doc in doc_by_id.items()}
+# Only the per-document arrays are needed here (MUST MATCH build_forward_index.py)
+with np.load(FORWARD_INDEX_PATH) as forward_index:
+    forward_player_ids = forward_index["player_ids"]
+    forward_player_names = forward_index["player_names"]
+    forward_total_terms = forward_index["total_terms"]
+# Per-document arrays (one row per doc), ordered by doc_id so posting doc_ids map to
+# rows with np.searchsorted; a repeated doc_id keeps its last entry
+_, last_rows = np.unique(forward_player_ids[::-1], return_index=True)
+doc_rows = len(forward_player_ids) - 1 - last_rows
+doc_id_arr = forward_player_ids[doc_rows].astype(np.int64)
+player_names = forward_player_names[doc_rows].tolist()  # "" when missing (NaN in results)
+total_terms_arr = forward_total_terms[doc_rows]
+N = len(doc_id_arr)
+avg_doc_len = int(total_terms_arr.sum()) / N if N > 0 else 0.0
+doc_len_arr = total_terms_arr.astype(np.float64)
+# BM25 parts that only depend on the static index, computed once:
+# the length normalization 1 - b + b * doc_len / avg_doc_len per document, and the IDF per term
+doc_norm_arr = 1 - B + B * (doc_len_arr / avg_doc_len) if N > 0 else doc_len_arr
+idf_by_tid = [math.log((N - df + 0.5) / (df + 0.5) + 1.0) for df in term_document_frequency]
+# Name metadata as per-row string arrays, plus name token -> rows for counting query
+# tokens found in each matched name
+name_normalized = []
+name_raw_lower = []
+name_token_rows = {}
+for row, player_name in enumerate(player_names):
+    meta = build_name_metadata(player_name)
+    name_normalized.append(meta["normalized"])
+    name_raw_lower.append(meta["raw_lower"])
+    for tok in meta["token_set"]:
+        name_token_rows.setdefault(tok, []).append(row)
+name_normalized_arr = np.array(name_normalized, dtype=str)
+name_raw_lower_arr = np.array(name_raw_lower, dtype=str)
+del name_normalized, name_raw_lower
+name_token_rows = {tok: np.array(token_rows, dtype=np.int64) for tok, token_rows in name_token_rows.items()}
+# Normalized names in sorted order: exact and prefix matches are contiguous ranges
+# found by binary search
+name_sorted_rows = np.argsort(name_normalized_arr, kind="stable")
+name_sorted = name_normalized_arr[name_sorted_rows]
 print(f"[done] Forward index: {N:,} documents (avg_len={avg_doc_len:.2f})")
 
 print("[init] Loading term-to-barrel mapping...")
-with open(TERM_TO_BARREL_MAP_PATH, "r", encoding="utf-8") as f:
-    term_to_barrel = json.load(f)
+with open(TERM_TO_BARREL_MAP_PATH, "rb") as f:
+    # JSON object keys are strings; key by the int term_id once so lookups need no str()
+    term_to_barrel = {int(term_id): barrel_name for term_id, barrel_name in orjson.loads(f.read()).items()}
 print(f"[done] Term-to-barrel map loaded: {len(term_to_barrel):,} mappings")
 
+print("[init] Opening barrel store...")
+if os.path.exists(BARREL_DB_PATH):
+    # Read-only; add_document commits through WAL without blocking searches
+    barrel_store = sqlite3.connect(f"{Path(BARREL_DB_PATH).as_uri()}?mode=ro", uri=True)
+    barrel_store.execute(f"PRAGMA mmap_size={BARREL_STORE_MMAP_BYTES}")
+    print(f"[done] Barrel store: {BARREL_DB_PATH}")
+else:
+    barrel_store = None
+    print(f"[error] Barrel store not found: {BARREL_DB_PATH}")
+
 print("[init] Loading market values...")
 player_market_value = load_market_values(MARKET_VALUE_PATH)
 max_market_value = max(player_market_value.values(), default=0.0)
@@ -169,52 +253,129 @@ max_profile_length = max(profile_length_by_id.values(), default=0)
 profile_length_log_max = math.log1p(max_profile_length) if max_profile_length > 0 else 1.0
 print(f"[done] Profile metadata loaded for {len(profile_length_by_id):,} players")
 
-# ---------- BARREL CACHE (LRU-like) ----------
+def popularity_boosts(values_by_id, weight, log_max):
+    """Per-document-row boost weight * log1p(value) / log_max (0.0 when unknown)."""
+    boosts = np.zeros(N)
+    if log_max > 0.0:
+        for row, doc_id in enumerate(doc_id_arr.tolist()):
+            value = values_by_id.get(doc_id)
+            if value:
+                boosts[row] = weight * (math.log1p(value) / log_max)
+    return boosts
+
+# Added to every name-matched document's score, indexed like doc_id_arr
+market_value_boost_arr = popularity_boosts(player_market_value, MARKET_VALUE_WEIGHT, market_value_log_max)
+profile_length_boost_arr = popularity_boosts(profile_length_by_id, PROFILE_LENGTH_WEIGHT, profile_length_log_max)
+
+# ---------- POSTINGS CACHE (LRU) ----------
+
+# term_id -> (document rows, BM25 contributions) of its postings, least recently used
+# term first; both only depend on the static index, so they are computed once per load
+postings_cache = OrderedDict()
+MAX_CACHED_TERMS = 500  # Keep only 500 terms' postings in memory at once
+
+# The PINNED_TERMS terms with the longest posting lists are loaded at startup and
+# kept outside the LRU, so rare terms never evict them
+PINNED_TERMS = 50
+pinned_postings = {}
+
+# Postings rows: little-endian blob [int32 df, int32 doc_ids..., uint16 tfs...] (MUST MATCH add_document.py)
+DOC_ID_DTYPE = np.dtype("<i4")
+TF_DTYPE = np.dtype("<u2")
 
-barrel_cache = {}
-MAX_CACHED_BARRELS = 10  # Keep only 10 barrels in memory at once
+def barrel_id(barrel_name: str) -> int:
+    return int(barrel_name.rsplit("_", 1)[1])
 
-def load_barrel(barrel_name: str):
-    """Load a barrel file and cache it. Implements simple LRU eviction."""
-    if barrel_name in barrel_cache:
-        return barrel_cache[barrel_name]
+def posting_rows(tid: int, doc_ids, tfs):
+    """Document rows and BM25 contributions for one term's postings.
+
+    A term found in every document has no contributions (None): its IDF is at the
+    floor log(1 + 0.5 / (N + 0.5)), so it still matches documents but carries no
+    ranking signal.
+    """
+    rows = np.searchsorted(doc_id_arr, doc_ids)
+    # Skip documents added after the forward index was loaded
+    known = rows < N
+    known[known] = doc_id_arr[rows[known]] == doc_ids[known]
+    rows = rows[known]
+    if term_document_frequency[tid] >= N:
+        return rows, None
+    return rows, bm25_scores(tfs[known].astype(np.float64), idf_by_tid[tid], doc_norm_arr[rows])
+
+def load_terms_postings(term_barrels: dict):
+    """Get {tid: (rows, contributions)} for {tid: barrel_name}, caching them. Implements LRU eviction.
+
+    Terms not in the cache are read from the barrel store in a single query.
+    """
+    loaded = {}
+    missing = []
+    for tid, barrel_name in term_barrels.items():
+        if tid in pinned_postings:
+            loaded[tid] = pinned_postings[tid]
+        elif tid in postings_cache:
+            postings_cache.move_to_end(tid)
+            loaded[tid] = postings_cache[tid]
+        else:
+            missing.append((barrel_id(barrel_name), tid))
+    if not missing or barrel_store is None:
+        return loaded
     
-    barrel_path = os.path.join(BARREL_DIR, f"{barrel_name}.json")
-    try:
-        with open(barrel_path, "r", encoding="utf-8") as f:
-            barrel_data = json.load(f)
-        
-        # Cache management
-        if len(barrel_cache) >= MAX_CACHED_BARRELS:
-            # Remove oldest (first) entry
-            oldest_key = next(iter(barrel_cache))
-            del barrel_cache[oldest_key]
-        
-        barrel_cache[barrel_name] = barrel_data
-        return barrel_data
-    except FileNotFoundError:
-        print(f"[error] Barrel file not found: {barrel_path}")
-        return None
+    # Joining a VALUES list keeps one primary-key lookup per term
+    rows = barrel_store.execute(
+        "SELECT q.column2, p.data FROM (VALUES " + ", ".join(["(?, ?)"] * len(missing)) + ") AS q "
+        "JOIN postings AS p ON p.barrel_id = q.column1 AND p.term_id = q.column2",
+        [value for key in missing for value in key]
+    ).fetchall()
+    for tid, data in rows:
+        # Zero-copy views over the row blob; the df header is not needed (lexicon DFs are used)
+        n = (len(data) - DOC_ID_DTYPE.itemsize) // (DOC_ID_DTYPE.itemsize + TF_DTYPE.itemsize)
+        loaded[tid] = postings_cache[tid] = posting_rows(
+            tid,
+            np.frombuffer(data, dtype=DOC_ID_DTYPE, count=n, offset=DOC_ID_DTYPE.itemsize),
+            np.frombuffer(data, dtype=TF_DTYPE, count=n, offset=DOC_ID_DTYPE.itemsize * (1 + n))
+        )
+    
+    # Cache management
+    while len(postings_cache) > MAX_CACHED_TERMS:
+        # Remove least recently used (first) entry
+        postings_cache.popitem(last=False)
+    return loaded
 
 # ---------- QUERY TO TERM IDs ----------
 
-def tokens_to_term_ids(tokens):
+def tokenize_query(query: str):
+    """Stemmed query tokens (stop words dropped) and their distinct term_ids, in one pass."""
+    tokens = []
+    term_ids = []
     seen = set()
-    unique_term_ids = []
-    for tok in tokens:
-        tid = token_to_id.get(tok)
-        if tid is None or tid in seen:
+    for w in tokenize(query):
+        if len(w) <= 2 or w in COMPREHENSIVE_STOP_WORDS:
             continue
-        seen.add(tid)
-        unique_term_ids.append(tid)
-    return unique_term_ids
+        tok = simple_stemmer(w)
+        tokens.append(tok)
+        tid = token_to_id.get(tok)
+        if tid is not None and tid not in seen:
+            seen.add(tid)
+            term_ids.append(tid)
+    return tokens, term_ids
 
 # ---------- BM25 SCORING ----------
 
-def bm25_score(tf, df, doc_len, N, avg_doc_len, k1=K1, b=B):
-    idf = math.log((N - df + 0.5) / (df + 0.5) + 1.0)
-    denom = tf + k1 * (1 - b + b * (doc_len / avg_doc_len))
-    return idf * (tf * (k1 + 1) / denom)
+def bm25_scores(tfs, idf, doc_norms, k1=K1):
+    """BM25 contribution of one term for arrays of tfs and matching doc_norm_arr entries."""
+    return idf * (tfs * (k1 + 1) / (tfs + k1 * doc_norms))
+
+# ---------- PINNED HOT TERMS ----------
+
+print("[init] Preloading hot terms...")
+hot_terms = [tid for tid in np.argsort(term_document_frequency, kind="stable")[::-1].tolist()
+             if tid in term_to_barrel][:PINNED_TERMS]
+load_terms_postings({tid: term_to_barrel[tid] for tid in hot_terms})
+for tid in hot_terms:
+    if tid in postings_cache:
+        pinned_postings[tid] = postings_cache.pop(tid)
+print(f"[done] Pinned {len(pinned_postings)} terms "
+      f"({sum(len(rows) for rows, _ in pinned_postings.values()):,} postings)")
 
 # ---------- BARREL-BASED SEARCH ----------
 
@@ -224,8 +385,7 @@ def search(query: str, top_k: int = 10, verbose: bool = True):
     log = print if verbose else (lambda *args, **kwargs: None)
     
     log(f"\n[query] {query}")
-    query_tokens = normalize_and_tokenize(query)
-    term_ids = tokens_to_term_ids(query_tokens)
+    query_tokens, term_ids = tokenize_query(query)
     
     if not term_ids:
         elapsed = (time.perf_counter() - start_time) * 1000
@@ -233,116 +393,114 @@ def search(query: str, top_k: int = 10, verbose: bool = True):
         return []
     
     log("Query tokens -> term_ids:",
-        [(termid_to_token.get(tid, "?"), tid) for tid in term_ids])
+        [(termid_to_token[tid], tid) for tid in term_ids])
     
-    # **KEY OPTIMIZATION: Determine which barrels to load**
-    required_barrels = set()
-    for tid in term_ids:
-        barrel_name = term_to_barrel.get(str(tid))
-        if barrel_name:
-            required_barrels.add(barrel_name)
+    # **KEY OPTIMIZATION: Read only the query terms' rows from the barrel store**
+    term_barrels = {tid: term_to_barrel[tid] for tid in term_ids if term_to_barrel.get(tid)}
+    required_barrels = set(term_barrels.values())
     
-    log(f"[barrels] Loading {len(required_barrels)} barrel(s): {sorted(required_barrels)}")
+    log(f"[barrels] Reading {len(term_ids)} term(s) from {len(required_barrels)} barrel(s): {sorted(required_barrels)}")
     
-    # Load only required barrels
     barrel_load_start = time.perf_counter()
-    loaded_barrels = {}
-    for barrel_name in required_barrels:
-        barrel_data = load_barrel(barrel_name)
-        if barrel_data:
-            loaded_barrels[barrel_name] = barrel_data
+    loaded_terms = load_terms_postings(term_barrels)
     barrel_load_time = (time.perf_counter() - barrel_load_start) * 1000
     log(f"[barrels] Loaded in {barrel_load_time:.2f} ms")
     
-    # BM25 scoring using barrel data
-    scores = defaultdict(float)
+    # BM25 scoring using barrel data (contributions are precomputed per cached term)
+    matched_rows = []
+    scored_rows = []
+    contributions = []
     
     for tid in term_ids:
-        df = term_document_frequency.get(tid, 0)
+        df = term_document_frequency[tid]
         if df == 0:
             continue
         
-        # Get barrel for this term
-        barrel_name = term_to_barrel.get(str(tid))
-        if not barrel_name or barrel_name not in loaded_barrels:
-            continue
-        
-        barrel_data = loaded_barrels[barrel_name]
-        inverted_index_part = barrel_data.get("inverted_index", {})
-        
         # Get postings for this term
-        term_data = inverted_index_part.get(str(tid))
-        if not term_data:
+        term_data = loaded_terms.get(tid)
+        if term_data is None:
             continue
         
-        postings = term_data.get("postings", {})
-        
-        for doc_id_str, info in postings.items():
-            doc_id = int(doc_id_str)
-            tf = info["tf"]
-            doc_len = doc_by_id[doc_id]["total_terms"]
-            scores[doc_id] += bm25_score(tf, df, doc_len, N, avg_doc_len)
+        rows, term_contributions = term_data
+        matched_rows.append(rows)
+        if term_contributions is not None:
+            scored_rows.append(rows)
+            contributions.append(term_contributions)
     
-    # Metadata boosting (same as before)
-    if scores:
-        query_name_tokens = normalize_name_tokens(query)
-        query_name = " ".join(query_name_tokens)
-        raw_query_lower = query.lower().strip()
-        
-        for doc_id in scores:
-            boost = 0.0
-            meta = name_metadata.get(doc_id)
-            has_name_match = False
-            match_count = 0
-            
-            if meta:
-                if query_tokens:
-                    match_count = sum(1 for tok in query_tokens if tok in meta["token_set"])
-                    if match_count:
-                        boost += NAME_TOKEN_WEIGHT * match_count
-                        has_name_match = True
-                
-                if query_name:
-                    if meta["normalized"] == query_name:
-                        boost += EXACT_NAME_BONUS
-                        has_name_match = True
-                    elif meta["normalized"].startswith(query_name):
-                        boost += NAME_PREFIX_BONUS
-                        has_name_match = True
-                
-                if raw_query_lower and raw_query_lower in meta["raw_lower"]:
-                    boost += RAW_SUBSTRING_BONUS
-                    has_name_match = True
-            
-            if not has_name_match and query_tokens:
-                boost -= NON_NAME_MATCH_PENALTY
-            
-            if has_name_match:
-                value = player_market_value.get(doc_id)
-                if value and market_value_log_max > 0.0:
-                    boost += MARKET_VALUE_WEIGHT * (math.log1p(value) / market_value_log_max)
-                
-                length = profile_length_by_id.get(doc_id)
-                if length and profile_length_log_max > 0.0:
-                    boost += PROFILE_LENGTH_WEIGHT * (math.log1p(length) / profile_length_log_max)
-            
-            scores[doc_id] += boost
+    # All terms' contributions summed per document in one scatter pass (bincount adds
+    # them in term order), and matched documents in first-match order (keeps tie
+    # order stable for ranking)
+    rows = np.empty(0, dtype=np.int64)
+    if matched_rows:
+        all_rows = np.concatenate(matched_rows)
+        doc_scores = np.zeros(N)
+        if scored_rows:
+            doc_scores = np.bincount(np.concatenate(scored_rows), weights=np.concatenate(contributions), minlength=N)
+        _, first_match = np.unique(all_rows, return_index=True)
+        rows = all_rows[np.sort(first_match)]
     
-    if not scores:
+    if not len(rows):
         elapsed = (time.perf_counter() - start_time) * 1000
         log(f"No documents matched these terms. (took {elapsed:.2f} ms)")
         return []
     
-    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+    # Metadata boosting: name matches as boolean masks over the matched rows,
+    # popularity boosts by row
+    query_name_tokens = normalize_name_tokens(query)
+    query_name = " ".join(query_name_tokens)
+    raw_query_lower = query.lower().strip()
+    
+    # Query tokens (repeats included) found in each name
+    token_counts = np.zeros(N, dtype=np.int64)
+    for tok in query_tokens:
+        token_rows = name_token_rows.get(tok)
+        if token_rows is not None:
+            token_counts[token_rows] += 1
+    match_counts = token_counts[rows]
+    name_matched = match_counts > 0
+    name_boosts = NAME_TOKEN_WEIGHT * match_counts
+    
+    if query_name:
+        # Names equal to query_name, then the names that only start with it (every
+        # such name sorts below query_name with its last character incremented)
+        exact_start = np.searchsorted(name_sorted, query_name, side="left")
+        exact_end = np.searchsorted(name_sorted, query_name, side="right")
+        prefix_end = np.searchsorted(name_sorted, query_name[:-1] + chr(ord(query_name[-1]) + 1))
+        exact = np.isin(rows, name_sorted_rows[exact_start:exact_end])
+        prefix = np.isin(rows, name_sorted_rows[exact_end:prefix_end])
+        name_boosts += np.where(exact, EXACT_NAME_BONUS, np.where(prefix, NAME_PREFIX_BONUS, 0.0))
+        name_matched |= exact | prefix
+    
+    if raw_query_lower:
+        substring = np.strings.find(name_raw_lower_arr[rows], raw_query_lower) >= 0
+        name_boosts += np.where(substring, RAW_SUBSTRING_BONUS, 0.0)
+        name_matched |= substring
+    
+    unmatched_boosts = name_boosts - NON_NAME_MATCH_PENALTY if query_tokens else name_boosts
+    scores = doc_scores[rows] + np.where(
+        name_matched,
+        name_boosts + market_value_boost_arr[rows] + profile_length_boost_arr[rows],
+        unmatched_boosts
+    )
+    
+    # Top-k: partition around the k-th best score (keeping every tie with it), then
+    # stable-sort only those candidates so ties stay in first-match order
+    top_k = max(top_k, 0)
+    candidates = np.arange(len(scores))
+    if top_k < len(scores):
+        kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k] if top_k else np.inf
+        candidates = np.flatnonzero(scores >= kth_score)
+    top = candidates[np.argsort(-scores[candidates], kind="stable")[:top_k]]
+    ranked = zip(rows[top].tolist(), scores[top].tolist())
     
     results = []
-    for rank, (doc_id, score) in enumerate(ranked, start=1):
-        doc = doc_by_id[doc_id]
+    for rank, (row, score) in enumerate(ranked, start=1):
+        doc_id = int(doc_id_arr[row])
         results.append({
             "rank": rank,
             "doc_id": doc_id,
-            "player_id": doc["player_id"],
-            "player_name": doc["player_name"],
+            "player_id": doc_id,
+            "player_name": player_names[row] or math.nan,
             "score": score,
             "market_value": player_market_value.get(doc_id),
         })
@@ -362,7 +520,7 @@ def search(query: str, top_k: int = 10, verbose: bool = True):
         log(f"{r['rank']:2d}. [{r['score']:.3f}] {r['player_name']} (player_id={r['player_id']}){extra_text}")
     
     log(f"\n[time] {elapsed:.2f} ms (barrel_load={barrel_load_time:.2f} ms)")
-    log(f"[memory] {len(barrel_cache)} barrels cached, {len(required_barrels)} loaded for this query")
+    log(f"[memory] {len(postings_cache)} terms cached (+{len(pinned_postings)} pinned), {len(loaded_terms)} loaded for this query")
     
     if elapsed < 500:
         log("[perf]Under 500 ms goal")
@@ -375,7 +533,7 @@ def search(query: str, top_k: int = 10, verbose: bool = True):
 
 if __name__ == "__main__":
     print("\n[ready] BARREL-OPTIMIZED search engine ready.")
-    print(f"[info] System loads only required barrels per query (max {MAX_CACHED_BARRELS} cached)")
+    print(f"[info] System reads only the query terms' postings per query (max {MAX_CACHED_TERMS} terms cached)")
     print("[info] Type a query or press Enter to exit.\n")
     
     while True: